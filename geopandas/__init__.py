@@ -4,8 +4,8 @@ from geopandas.array import _points_from_xy as points_from_xy
 
 from geopandas.io.file import read_file
 from geopandas.io.sql import read_postgis
-from geopandas.tools import sjoin
-from geopandas.tools import overlay
+from geopandas.tools import sjoin, sjoin_aggregate, sjoin_iter, sjoin_nearest
+from geopandas.tools import clip, overlay, overlay_iter, overlay_to_file
 
 import geopandas.datasets
 
@@ -5,7 +5,8 @@ import pandas as pd
 from pandas import Series, DataFrame, MultiIndex
 from pandas.core.indexing import _NDFrameIndexer
 
-from shapely.geometry.base import BaseGeometry
+from shapely.geometry.base import BaseGeometry, BaseMultipartGeometry
+from shapely import prepared
 from shapely.geometry import box
 from shapely.ops import cascaded_union, unary_union
 import shapely.affinity as affinity
@@ -83,22 +84,47 @@ def _delegate_geo_method(op, this, *args, **kwargs):
 class GeoPandasBase(object):
     _sindex = None
     _sindex_generated = False
+    _sindex_source = None
+    _sindex_build = None
+    _sindex_state = None
+
+    def _make_sindex(self, backend='rtree'):
+        """
+        Returns a closure that builds and returns the spatial index of the
+        current geometries (or None if there is nothing to index).
+        """
+        from geopandas.sindex import (
+            _build_sindex, _build_point_grid, _derive_sindex, _restore_sindex)
+        values = self._geometry_values()
+        labels = self.index
+        source = self._sindex_source
+        state = self._sindex_state
+
+        if backend == 'grid':
+            if state is not None and state['backend'] == 'grid':
+                return lambda: _restore_sindex(state, labels)
+            return lambda: _build_point_grid(values, labels)
+
+        def make():
+            sindex = None
+            if state is not None:
+                # unpickled together with the geometries
+                sindex = _restore_sindex(state, labels)
+            elif source is not None:
+                sindex = _derive_sindex(values, labels, source)
+            if sindex is None:
+                sindex = _build_sindex(values, labels)
+            return sindex
+
+        return make
 
     def _generate_sindex(self):
         if not HAS_SINDEX:
             warn("Cannot generate spatial index: Missing package `rtree`.")
         else:
-            from geopandas.sindex import SpatialIndex
-            stream = ((i, item.bounds, idx) for i, (idx, item) in
-                      enumerate(self.geometry.iteritems())
-                      if pd.notnull(item) and not item.is_empty)
-            try:
-                self._sindex = SpatialIndex(stream)
-            # What we really want here is an empty generator error, or
-            # for the bulk loader to log that the generator was empty
-            # and move on. See https://github.com/Toblerity/rtree/issues/20.
-            except RTreeError:
-                pass
+            self._sindex = self._make_sindex()()
+        self._sindex_source = None
+        self._sindex_state = None
         self._sindex_generated = True
 
     def _invalidate_sindex(self):
@@ -109,6 +135,70 @@ class GeoPandasBase(object):
         """
         self._sindex = None
         self._sindex_generated = False
+        self._sindex_source = None
+        self._sindex_build = None
+        self._sindex_state = None
+
+    def _share_sindex(self, other):
+        """
+        Use the spatial index of ``other``, which has the same geometries
+        and index (e.g. a copy), also when it is still being built.
+
+        The index is only shared the first time it is requested, after
+        checking that none of the geometries were replaced in the meantime
+        (e.g. with ``.loc``), so it is rebuilt if they were.
+        """
+        if other._sindex_state is not None:
+            # restore it once, instead of in every copy
+            other.sindex
+        self._derive_sindex(other)
+        if other._sindex_build is not None and HAS_SINDEX:
+            self._sindex_source = (other._sindex_build,
+                                   other._geometry_values(), other.index)
+
+    def _sindex_pickle_state(self):
+        """
+        The arrays needed to restore the spatial index after unpickling, or
+        None if it has not been generated.
+        """
+        if self._sindex_build is not None and self._sindex_build.done():
+            self.sindex
+        if self._sindex_generated and self._sindex is not None:
+            return self._sindex._state()
+        return self._sindex_state
+
+    def _derive_sindex(self, other):
+        """
+        Invalidate the spatial index, but remember the spatial index of
+        ``other`` (the object this one was taken from) so the next time it
+        is requested, it can be derived from that index instead of being
+        rebuilt from scratch.
+
+        This is only done if a large enough part of the rows is kept, see
+        ``geopandas.sindex.SUBSET_VIEW_MIN_FRACTION``.
+        """
+        self._invalidate_sindex()
+        if not isinstance(other, GeoPandasBase) or not HAS_SINDEX:
+            return
+        if other._sindex_generated:
+            if other._sindex is None:
+                return
+            try:
+                values = other._geometry_values()
+            except AttributeError:
+                return
+            source = (other._sindex, values, other.index)
+        elif other._sindex_source is not None:
+            source = other._sindex_source
+        else:
+            return
+        from geopandas.sindex import SUBSET_VIEW_MIN_FRACTION
+        if len(self) >= SUBSET_VIEW_MIN_FRACTION * len(source[1]):
+            self._sindex_source = source
+
+    def _geometry_values(self):
+        """Returns the array of geometries, without any copying"""
+        return self.geometry.values
 
     @property
     def area(self):
@@ -488,10 +578,83 @@ class GeoPandasBase(object):
 
     @property
     def sindex(self):
+        if self._sindex_build is not None:
+            # wait for the index that is being built in the background
+            self._sindex = self._sindex_build.result()
+            self._sindex_source = None
+            self._sindex_state = None
+            self._sindex_generated = True
+            self._sindex_build = None
         if not self._sindex_generated:
             self._generate_sindex()
         return self._sindex
 
+    @property
+    def has_sindex(self):
+        """
+        Whether a spatial index is available without building one from
+        scratch: already generated, being built in the background, or
+        derivable from the index of the object this one was taken from.
+        """
+        if self._sindex_generated:
+            return self._sindex is not None
+        return (self._sindex_build is not None
+                or self._sindex_source is not None
+                or self._sindex_state is not None)
+
+    def build_sindex(self, background=False, backend='rtree'):
+        """
+        Build the spatial index, if it is not yet available.
+
+        The spatial index is otherwise built lazily the first time the
+        ``sindex`` attribute is accessed.
+
+        Parameters
+        ----------
+        background : bool, default False
+            If True, construct the index in a worker thread and return
+            immediately, so the construction overlaps with other work. The
+            next access of ``sindex`` waits for the construction to finish.
+        backend : {'rtree', 'grid'}, default 'rtree'
+            The type of spatial index. 'rtree' builds a ``SpatialIndex`` (an
+            R-tree). 'grid' builds a ``PointGridIndex``, which bins the
+            geometries in a uniform grid and only supports points, but is
+            faster to build and uses less memory for large point datasets.
+            It does not need the `rtree` package.
+
+        Returns
+        -------
+        SpatialIndexFuture
+            Handle on the construction, with ``done()`` and ``result()``
+            methods that return whether the construction finished and the
+            (awaited) spatial index.
+
+        Examples
+        --------
+        >>> future = df.build_sindex(background=True)
+        >>> # ... process the attributes of df ...
+        >>> df.sindex  # only waits for the remainder of the construction
+        """
+        from geopandas.sindex import PointGridIndex, SpatialIndexFuture
+        if backend not in ('rtree', 'grid'):
+            raise ValueError("Unknown spatial index backend '{0}', expected "
+                             "'rtree' or 'grid'".format(backend))
+        if self._sindex_build is not None:
+            return self._sindex_build
+        if backend == 'grid' and not isinstance(self._sindex, PointGridIndex):
+            self._invalidate_sindex()
+        elif not HAS_SINDEX or self._sindex_generated:
+            return SpatialIndexFuture(result=self.sindex)
+        make = self._make_sindex(backend)
+        if background:
+            self._sindex_build = SpatialIndexFuture(make)
+            return self._sindex_build
+        self._sindex = make()
+        self._sindex_source = None
+        self._sindex_state = None
+        self._sindex_generated = True
+        return SpatialIndexFuture(result=self._sindex)
+
     def buffer(self, distance, resolution=16, **kwargs):
         """Returns a ``GeoSeries`` of geometries representing all points within
         a given `distance` of each geometric object.
@@ -672,7 +835,7 @@ class GeoPandasBase(object):
         return _delegate_geo_method('skew', self, xs, ys, origin=origin,
                                     use_radians=use_radians)
 
-    def explode(self):
+    def explode(self, index_parts=True):
         """
         Explode multi-part geometries into multiple single geometries.
 
@@ -680,6 +843,13 @@ class GeoPandasBase(object):
         This is analogous to PostGIS's ST_Dump(). The 'path' index is the
         second level of the returned MultiIndex
 
+        Parameters
+        ----------
+        index_parts : boolean, default True
+            If True, the index gets an extra level with the number of every
+            single geometry within its multi-part geometry. If False, the
+            single geometries get the index of their multi-part geometry.
+
         Returns
         ------
         A GeoSeries with a MultiIndex. The levels of the MultiIndex are the
@@ -701,21 +871,46 @@ class GeoPandasBase(object):
         dtype: object
 
         """
-        index = []
-        geometries = []
-        for idx, s in self.geometry.iteritems():
-            if s.type.startswith('Multi') or s.type == 'GeometryCollection':
-                geoms = s.geoms
-                idxs = [(idx, i) for i in range(len(geoms))]
-            else:
-                geoms = [s]
-                idxs = [(idx, 0)]
-            index.extend(idxs)
-            geometries.extend(geoms)
-        index = MultiIndex.from_tuples(index, names=self.index.names + [None])
+        counts, geometries = _explode(self.geometry.values)
+        index = _explode_index(self.index, counts, index_parts)
         return gpd.GeoSeries(geometries, index=index).__finalize__(self)
 
 
+def _explode(geoms):
+    """
+    The number of parts of each of the ``geoms``, and an object array with
+    all the parts: the single geometries of the multi-part geometries and
+    geometry collections, and the other geometries themselves.
+    """
+    counts = np.ones(len(geoms), dtype=np.intp)
+    parts = []
+    for i, geom in enumerate(geoms):
+        if isinstance(geom, BaseMultipartGeometry):
+            start = len(parts)
+            parts.extend(geom.geoms)
+            counts[i] = len(parts) - start
+        else:
+            parts.append(geom)
+    values = np.empty(len(parts), dtype=object)
+    values[:] = parts
+    return counts, values
+
+
+def _explode_index(index, counts, index_parts=True):
+    """
+    The ``index`` repeated for the ``counts`` parts of each row, with an
+    extra level numbering the parts if ``index_parts``.
+    """
+    repeated = index.repeat(counts)
+    if not index_parts:
+        return repeated
+    starts = np.cumsum(counts) - counts
+    numbers = np.arange(len(repeated)) - np.repeat(starts, counts)
+    levels = [repeated.get_level_values(i) for i in range(index.nlevels)]
+    return MultiIndex.from_arrays(levels + [numbers],
+                                  names=list(index.names) + [None])
+
+
 class _CoordinateIndexer(_NDFrameIndexer):
     """
     Coordinate based indexer to select by intersection with bounding box.
@@ -737,10 +932,54 @@ class _CoordinateIndexer(_NDFrameIndexer):
         # don't know how to handle step; should this raise?
         if xs.step is not None or ys.step is not None:
             warn("Ignoring step - full interval is used.")
-        xmin, ymin, xmax, ymax = obj.total_bounds
-        bbox = box(xs.start if xs.start is not None else xmin,
-                   ys.start if ys.start is not None else ymin,
-                   xs.stop if xs.stop is not None else xmax,
-                   ys.stop if ys.stop is not None else ymax)
-        idx = obj.intersects(bbox)
-        return obj[idx]
+        xmin = xs.start if xs.start is not None else -np.inf
+        ymin = ys.start if ys.start is not None else -np.inf
+        xmax = xs.stop if xs.stop is not None else np.inf
+        ymax = ys.stop if ys.stop is not None else np.inf
+        # like a shapely box, reversed intervals cover the same area
+        xmin, xmax = min(xmin, xmax), max(xmin, xmax)
+        ymin, ymax = min(ymin, ymax), max(ymin, ymax)
+        return obj[_box_mask(obj, (xmin, ymin, xmax, ymax))]
+
+
+def _box_mask(obj, bbox):
+    """
+    Boolean array of the geometries of ``obj`` that intersect the box
+    ``bbox`` (minx, miny, maxx, maxy), whose sides may be infinite.
+
+    The geometries are first filtered by their bounds, using the spatial
+    index if it is available. The ones with their bounds within the box
+    intersect it, and only the others are tested exactly.
+    """
+    from geopandas.sindex import _geometry_bounds
+    xmin, ymin, xmax, ymax = bbox
+    values = obj._geometry_values()
+    if obj.has_sindex and obj.sindex is not None:
+        limit = np.finfo(float).max
+        _, candidates = obj.sindex.query_bulk(
+            np.clip(np.array([bbox], dtype=float), -limit, limit))
+        candidates = np.sort(candidates)
+        bounds = _geometry_bounds(values[candidates])
+    else:
+        candidates = np.arange(len(values))
+        bounds = _geometry_bounds(values)
+    with np.errstate(invalid='ignore'):
+        overlap = ((bounds[:, 0] <= xmax) & (bounds[:, 1] <= ymax)
+                   & (bounds[:, 2] >= xmin) & (bounds[:, 3] >= ymin))
+        candidates, bounds = candidates[overlap], bounds[overlap]
+        within = ((bounds[:, 0] >= xmin) & (bounds[:, 1] >= ymin)
+                  & (bounds[:, 2] <= xmax) & (bounds[:, 3] <= ymax))
+
+    mask = np.zeros(len(values), dtype=bool)
+    mask[candidates[within]] = True
+    crossing, bounds = candidates[~within], bounds[~within]
+    if len(crossing):
+        # the infinite sides only need to reach beyond these geometries
+        bbox = box(max(xmin, bounds[:, 0].min()),
+                   max(ymin, bounds[:, 1].min()),
+                   min(xmax, bounds[:, 2].max()),
+                   min(ymax, bounds[:, 3].max()))
+        if bbox.area > 0:
+            bbox = prepared.prep(bbox)
+        mask[crossing] = [bbox.intersects(values[i]) for i in crossing]
+    return mask
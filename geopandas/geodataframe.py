@@ -1,13 +1,18 @@
 import json
+import multiprocessing
 
 import numpy as np
 import pandas as pd
 from pandas import DataFrame, Series
-from shapely.geometry import mapping, shape, Point
+from shapely.geometry import (
+    mapping, shape, MultiLineString, MultiPolygon, Point)
 from shapely.geometry.base import BaseGeometry
+from shapely.geometry.polygon import orient
+from shapely.ops import linemerge, polygonize, unary_union
 from six import string_types, PY3
 
-from geopandas.base import GeoPandasBase, _CoordinateIndexer
+from geopandas.base import (
+    GeoPandasBase, _CoordinateIndexer, _explode, _explode_index)
 from geopandas.geoseries import GeoSeries
 from geopandas.plotting import plot_dataframe
 import geopandas.io
@@ -54,8 +59,13 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
     # See https://github.com/pydata/pandas/pull/10557
     def __getstate__(self):
         meta = dict((k, getattr(self, k, None)) for k in self._metadata)
-        return dict(_data=self._data, _typ=self._typ,
-                    _metadata=self._metadata, **meta)
+        state = dict(_data=self._data, _typ=self._typ,
+                     _metadata=self._metadata, **meta)
+        # carry the spatial index along in its compact array form
+        sindex_state = self._sindex_pickle_state()
+        if sindex_state is not None:
+            state['_sindex_state'] = sindex_state
+        return state
 
     def __setattr__(self, attr, val):
         # have to special case geometry b/c pandas tries to use as column...
@@ -80,6 +90,14 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
     geometry = property(fget=_get_geometry, fset=_set_geometry,
                         doc="Geometry data for GeoDataFrame")
 
+    def _geometry_values(self):
+        # bypass __getitem__, which would derive the spatial index of the
+        # returned GeoSeries from this frame
+        if self._geometry_column_name not in self:
+            raise AttributeError("No geometry data set yet (expected in"
+                                 " column '%s'." % self._geometry_column_name)
+        return DataFrame.__getitem__(self, self._geometry_column_name).values
+
     def set_geometry(self, col, drop=False, inplace=False, crs=None):
         """
         Set the GeoDataFrame geometry using either an existing column or
@@ -471,12 +489,12 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
         if isinstance(key, string_types) and key == geo_col:
             result.__class__ = GeoSeries
             result.crs = self.crs
-            result._invalidate_sindex()
+            result._derive_sindex(self)
         elif isinstance(result, DataFrame) and geo_col in result:
             result.__class__ = GeoDataFrame
             result.crs = self.crs
             result._geometry_column_name = geo_col
-            result._invalidate_sindex()
+            result._derive_sindex(self)
         elif isinstance(result, DataFrame) and geo_col not in result:
             result.__class__ = DataFrame
         return result
@@ -514,6 +532,7 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
         else:
             for name in self._metadata:
                 object.__setattr__(self, name, getattr(other, name, None))
+            self._derive_sindex(other)
         return self
 
     def copy(self, deep=True):
@@ -533,7 +552,9 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
         data = self._data
         if deep:
             data = data.copy()
-        return GeoDataFrame(data).__finalize__(self)
+        result = GeoDataFrame(data).__finalize__(self)
+        result._share_sindex(self)
+        return result
 
     def plot(self, *args, **kwargs):
         """Generate a plot of the geometries in the ``GeoDataFrame``.
@@ -550,7 +571,8 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
     plot.__doc__ = plot_dataframe.__doc__
 
 
-    def dissolve(self, by=None, aggfunc='first', as_index=True):
+    def dissolve(self, by=None, aggfunc='first', as_index=True, n_jobs=1,
+                 method='unary'):
         """
         Dissolve geometries within `groupby` into single observation.
         This is accomplished by applying the `unary_union` method
@@ -568,26 +590,40 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
             with each group. Passed to pandas `groupby.agg` method.
         as_index : boolean, default True
             If true, groupby columns become index of result.
+        n_jobs : int, default 1
+            The number of worker processes that compute the unions of the
+            groups (-1 to use all CPUs). Large groups are split in parts
+            whose unions are computed in parallel as well.
+        method : string, default 'unary'
+            'unary' to merge the geometries with ``unary_union``, or
+            'coverage' for polygons that do not overlap, like a tiling of
+            parcels. Their shared edges are then removed and the remaining
+            edges are polygonized, which is much faster. Groups that turn
+            out not to be such a coverage are merged with ``unary_union``.
 
         Returns
         -------
         GeoDataFrame
         """
 
+        if method not in ['unary', 'coverage']:
+            raise ValueError("`method` was '{0}' but is expected to be "
+                             "'unary' or 'coverage'".format(method))
+
         # Process non-spatial component
         data = self.drop(labels=self.geometry.name, axis=1)
-        aggregated_data = data.groupby(by=by).agg(aggfunc)
-
+        grouped = data.groupby(by=by)
+        aggregated_data = grouped.agg(aggfunc)
 
-        # Process spatial component
-        def merge_geometries(block):
-            merged_geom = block.unary_union
-            return merged_geom
-
-        g = self.groupby(by=by, group_keys=False)[self.geometry.name].agg(merge_geometries)
+        # Process spatial component, with the groups in the same order
+        union = unary_union if method == 'unary' else _coverage_union
+        geoms = _union_groups(self.geometry.values, grouped.ngroup().values,
+                              grouped.ngroups, n_jobs, union)
 
         # Aggregate
-        aggregated_geometry = GeoDataFrame(g, geometry=self.geometry.name, crs=self.crs)
+        aggregated_geometry = GeoDataFrame(
+            {self.geometry.name: geoms}, index=aggregated_data.index,
+            geometry=self.geometry.name, crs=self.crs)
         # Recombine
         aggregated = aggregated_geometry.join(aggregated_data)
 
@@ -598,7 +634,7 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
         return aggregated
 
     # overrides GeoPandasBase method
-    def explode(self):
+    def explode(self, index_parts=True):
         """
         Explode muti-part geometries into multiple single geometries.
 
@@ -611,6 +647,12 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
         indicating the multiple geometries: a new zero-based index for each
         single part geometry per multi-part geometry).
 
+        Parameters
+        ----------
+        index_parts : boolean, default True
+            If False, the index is not extended with the extra level, and
+            the single geometries keep the index of their row.
+
         Returns
         -------
         GeoDataFrame
@@ -618,20 +660,135 @@ class GeoDataFrame(GeoPandasBase, DataFrame):
             as a separate entry in the geodataframe.
 
         """
-        df_copy = self.copy()
-
-        exploded_geom = df_copy.geometry.explode().reset_index(level=-1)
-        exploded_index = exploded_geom.columns[0]
-
-        df = pd.concat(
-            [df_copy.drop(df_copy._geometry_column_name, axis=1),
-             exploded_geom], axis=1)
-        # reset to MultiIndex, otherwise df index is only first level of
-        # exploded GeoSeries index.
-        df.set_index(exploded_index, append=True, inplace=True)
-        df.index.names = list(self.index.names) + [None]
-        geo_df = df.set_geometry(self._geometry_column_name)
-        return geo_df
+        counts, geometries = _explode(self.geometry.values)
+        geo_column = self.columns.get_loc(self._geometry_column_name)
+        columns = [i for i in range(self.shape[1]) if i != geo_column]
+        df = DataFrame(
+            self.iloc[np.repeat(np.arange(len(self)), counts), columns])
+        df.index = _explode_index(self.index, counts, index_parts)
+        df.insert(geo_column, self._geometry_column_name,
+                  GeoSeries(geometries, index=df.index, crs=self.crs))
+        return GeoDataFrame(df, geometry=self._geometry_column_name,
+                            crs=self.crs)
+
+
+def _union_groups(geoms, codes, ngroups, n_jobs=1, union=unary_union):
+    """
+    The ``union`` of the ``geoms`` of each of the ``ngroups`` groups, given
+    by the group ``codes`` of the geometries (-1 for none).
+
+    With ``n_jobs`` worker processes, the groups with more geometries than a
+    fair share of the tasks are split in parts, which are united in the
+    workers, and the unions of the parts are united at the end.
+    """
+    order = np.argsort(codes, kind='mergesort')
+    bounds = np.searchsorted(codes[order], np.arange(ngroups + 1))
+    if n_jobs == -1:
+        n_jobs = multiprocessing.cpu_count()
+    if n_jobs <= 1:
+        return [union(list(geoms[order[start:end]]))
+                for start, end in zip(bounds[:-1], bounds[1:])]
+
+    # a few tasks per worker to balance the load
+    size = max(int(np.ceil((bounds[-1] - bounds[0]) / (4.0 * n_jobs))), 2)
+    tasks = []
+    groups = []
+    for group, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        for part in range(start, end, size):
+            tasks.append(list(geoms[order[part:min(part + size, end)]]))
+            groups.append(group)
+    pool = multiprocessing.Pool(n_jobs)
+    try:
+        chunksize = int(np.ceil(len(tasks) / (4.0 * n_jobs)))
+        unions = pool.map(union, tasks, chunksize)
+    finally:
+        pool.close()
+        pool.join()
+
+    parts = [[] for _ in range(ngroups)]
+    for group, part in zip(groups, unions):
+        parts[group].append(part)
+    return [part[0] if len(part) == 1 else union(part) for part in parts]
+
+
+def _coverage_union(geoms):
+    """
+    The union of the polygons ``geoms``, which should not overlap.
+
+    The rings of the polygons are oriented counter-clockwise (their holes
+    clockwise), so that an edge shared by two polygons occurs once in each
+    direction. The edges that occur once are the edges of the union, which
+    are polygonized, keeping only the faces to the left of these edges.
+    Falls back to ``unary_union`` if the polygons do not form a coverage.
+    """
+    rings = []
+    area = 0.0
+    for geom in geoms:
+        if geom is None or geom.is_empty:
+            continue
+        if geom.type not in ['Polygon', 'MultiPolygon'] or geom.has_z:
+            return unary_union(geoms)
+        for polygon in getattr(geom, 'geoms', [geom]):
+            ring, ring_area = _oriented_ring(polygon.exterior, True)
+            rings.append(ring)
+            area += ring_area
+            for interior in polygon.interiors:
+                ring, ring_area = _oriented_ring(interior, False)
+                rings.append(ring)
+                area -= ring_area
+    if not rings:
+        return unary_union(geoms)
+
+    starts = np.concatenate([ring[:-1] for ring in rings])
+    ends = np.concatenate([ring[1:] for ring in rings])
+    keep = (starts != ends).any(axis=1)
+    starts, ends = starts[keep], ends[keep]
+    # the edges as (x0, y0, x1, y1) from their lowest point, and whether
+    # they were reversed to get there
+    reverse = ((ends[:, 0] < starts[:, 0])
+               | ((ends[:, 0] == starts[:, 0]) & (ends[:, 1] < starts[:, 1])))
+    keys = np.where(reverse[:, np.newaxis], np.hstack([ends, starts]),
+                    np.hstack([starts, ends]))
+    order = np.lexsort(keys.T[::-1])
+    keys, reverse = keys[order], reverse[order]
+    first = np.ones(len(keys), dtype=bool)
+    first[1:] = (keys[1:] != keys[:-1]).any(axis=1)
+    group = np.cumsum(first) - 1
+    counts = np.bincount(group)
+    reversed_counts = np.bincount(group, weights=reverse)
+    if (counts > 2).any() or ((counts == 2) & (reversed_counts != 1)).any():
+        # edges shared by more than two polygons, or in the same direction
+        return unary_union(geoms)
+    single = counts[group] == 1
+    keys, reverse = keys[single], reverse[single]
+    edges = np.where(reverse[:, np.newaxis], keys[:, [2, 3, 0, 1]],
+                     keys).reshape(-1, 2, 2)
+
+    edge_set = set(map(tuple, edges.reshape(-1, 4).tolist()))
+    faces = []
+    for face in polygonize(linemerge(MultiLineString(list(edges)))):
+        exterior = orient(face).exterior.coords
+        if tuple(exterior[0]) + tuple(exterior[1]) in edge_set:
+            faces.append(face)
+    if not faces:
+        return unary_union(geoms)
+    union = faces[0] if len(faces) == 1 else MultiPolygon(faces)
+    if not union.is_valid or abs(union.area - area) > 1e-9 * area:
+        return unary_union(geoms)
+    return union
+
+
+def _oriented_ring(ring, ccw):
+    """
+    The (n, 2) coordinates of ``ring``, oriented counter-clockwise if
+    ``ccw`` (clockwise otherwise), and the area it encloses.
+    """
+    coords = np.asarray(ring.coords)[:, :2]
+    x, y = coords[:, 0], coords[:, 1]
+    signed_area = (x[:-1] * y[1:] - x[1:] * y[:-1]).sum() / 2
+    if (signed_area > 0) != ccw:
+        coords = coords[::-1]
+    return coords, abs(signed_area)
 
 
 def _dataframe_set_geometry(self, col, drop=False, inplace=False, crs=None):
@@ -49,6 +49,14 @@ class GeoSeries(GeoPandasBase, Series):
         self.crs = crs
         self._invalidate_sindex()
 
+    def __getstate__(self):
+        state = super(GeoSeries, self).__getstate__()
+        # carry the spatial index along in its compact array form
+        sindex_state = self._sindex_pickle_state()
+        if sindex_state is not None:
+            state['_sindex_state'] = sindex_state
+        return state
+
     def append(self, *args, **kwargs):
         return self._wrapped_pandas_method('append', *args, **kwargs)
 
@@ -148,9 +156,10 @@ class GeoSeries(GeoPandasBase, Series):
         # NOTE: backported from pandas master (upcoming v0.13)
         for name in self._metadata:
             object.__setattr__(self, name, getattr(other, name, None))
+        self._derive_sindex(other)
         return self
 
-    def copy(self, order='C'):
+    def copy(self, deep=True):
         """
         Make a copy of this GeoSeries object
 
@@ -164,8 +173,11 @@ class GeoSeries(GeoPandasBase, Series):
         copy : GeoSeries
         """
         # FIXME: this will likely be unnecessary in pandas >= 0.13
-        return GeoSeries(self.values.copy(order), index=self.index,
-                      name=self.name).__finalize__(self)
+        values = self.values.copy() if deep else self.values
+        result = GeoSeries(values, index=self.index,
+                           name=self.name).__finalize__(self)
+        result._share_sindex(self)
+        return result
 
     def isna(self):
         """
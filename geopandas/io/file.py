@@ -39,7 +39,7 @@ def _is_url(url):
         return False
 
 
-def read_file(filename, bbox=None, **kwargs):
+def read_file(filename, bbox=None, build_sindex=False, **kwargs):
     """
     Returns a GeoDataFrame from a file or URL.
 
@@ -51,6 +51,9 @@ def read_file(filename, bbox=None, **kwargs):
     bbox : tuple | GeoDataFrame or GeoSeries, default None
         Filter features by given bounding box, GeoSeries, or GeoDataFrame.
         CRS mis-matches are resolved if given a GeoSeries or GeoDataFrame.
+    build_sindex : bool, default False
+        Start building the spatial index in a background thread right after
+        loading, see ``GeoDataFrame.build_sindex``.
     **kwargs:
         Keyword args to be passed to the `open` or `BytesCollection` method
         in the fiona library when opening the file. For more information on
@@ -95,6 +98,9 @@ def read_file(filename, bbox=None, **kwargs):
             columns = list(features.meta["schema"]["properties"]) + ["geometry"]
             gdf = GeoDataFrame.from_features(f_filt, crs=crs, columns=columns)
 
+    if build_sindex:
+        gdf.build_sindex(background=True)
+
     return gdf
 
 
@@ -254,6 +254,16 @@ def test_read_file_filtered_with_gdf_boundary_mismatched_crs(df_nybb):
     assert filtered_df_shape == (2, 5)
 
 
+@pytest.mark.skipif(not geopandas.base.HAS_SINDEX,
+                    reason='Rtree absent, skipping')
+def test_read_file_build_sindex():
+    nybb_filename = geopandas.datasets.get_path('nybb')
+    df = read_file(nybb_filename, build_sindex=True)
+    assert df._sindex_build is not None
+    assert len(list(df.sindex.intersection(df.total_bounds))) == 5
+    assert df._sindex_build is None
+
+
 def test_read_file_empty_shapefile(tmpdir):
 
     # create empty shapefile
@@ -1,10 +1,180 @@
+import sys
+import threading
+import time
+from warnings import warn
+
+import numpy as np
+from six.moves import cPickle as pickle
+from shapely.geometry import Point
+from shapely.geometry.base import BaseGeometry
+import six
+
 from geopandas import base
 
 if base.HAS_SINDEX:
     from rtree.index import Index as RTreeIndex
+else:
+    RTreeIndex = object
+
+
+# Minimum fraction of the rows of the parent a subset needs to keep for its
+# spatial index to be derived as a view on the parent index. Smaller subsets
+# build a fresh (and much smaller) tree instead.
+SUBSET_VIEW_MIN_FRACTION = 0.25
+
+
+_STATS_HOOKS = []
+
+
+def add_stats_hook(hook):
+    """
+    Register a function that is called for every counted event of every
+    spatial index, e.g. to feed a monitoring system.
+
+    The hook is called as ``hook(sindex, event, counts)``, with ``event``
+    one of:
+
+    - 'build': the index was built, ``counts`` holds the 'size' and the
+      'build_time' in seconds.
+    - 'query': the index was queried, ``counts`` holds the number of
+      'queries' (more than one for bulk queries) and the number of
+      'candidates' they returned.
+    - 'refine': query candidates were refined with an exact predicate (e.g.
+      in ``sjoin`` or ``overlay``), ``counts`` holds the number of
+      'candidates' and of true 'matches'.
+    """
+    _STATS_HOOKS.append(hook)
+
+
+def remove_stats_hook(hook):
+    """Unregister a function registered with ``add_stats_hook``."""
+    _STATS_HOOKS.remove(hook)
+
+
+class _IndexStats(object):
+    """
+    Mixin keeping the build time and the query and refinement counters of
+    a spatial index, reported by ``stats()``.
+
+    Subclasses provide ``_structure_stats()``, returning the statistics on
+    the structure of the index, and ``_query_ids(bbox)``, returning an array
+    with the ids of the entries intersecting ``bbox`` (used by the default
+    ``query_bulk``), unless they override ``query_bulk``.
+    """
+
+    _build_time = None
+    _counters = None
+
+    def _get_counters(self):
+        if self._counters is None:
+            self._counters = dict.fromkeys(
+                ['queries', 'candidates', 'refined_candidates', 'matches'], 0)
+        return self._counters
 
+    def _record(self, event, **counts):
+        counters = self._get_counters()
+        if event == 'query':
+            counters['queries'] += counts['queries']
+            counters['candidates'] += counts['candidates']
+        elif event == 'refine':
+            counters['refined_candidates'] += counts['candidates']
+            counters['matches'] += counts['matches']
+        for hook in _STATS_HOOKS:
+            hook(self, event, counts)
 
-class SpatialIndex(RTreeIndex):
+    def _counted(self, hits):
+        """Yield the hits of a single query, counting them"""
+        n = 0
+        try:
+            for hit in hits:
+                n += 1
+                yield hit
+        finally:
+            self._record('query', queries=1, candidates=n)
+
+    def _built(self, start):
+        self._build_time = time.time() - start
+        if _STATS_HOOKS:
+            self._record('build', size=self.size,
+                         build_time=self._build_time)
+
+    def record_refinement(self, candidates, matches):
+        """
+        Record that ``candidates`` query results were refined with an exact
+        predicate, of which ``matches`` were true matches.
+        """
+        self._record('refine', candidates=candidates, matches=matches)
+
+    def query_bulk(self, bounds):
+        """
+        Query the index with many bounding boxes at once.
+
+        Parameters
+        ----------
+        bounds : array-like of shape (n, 4)
+            The minx, miny, maxx, maxy of each bounding box. Rows holding NaN
+            (e.g. the bounds of missing or empty geometries) match nothing.
+
+        Returns
+        -------
+        numpy.ndarray of int, shape (2, k)
+            The positions of the bounding boxes (in increasing order) and
+            the ids of the entries whose bounds intersect them.
+        """
+        bounds, positions = _valid_bounds(bounds)
+        hits = [self._query_ids(bbox) for bbox in bounds.tolist()]
+        counts = np.array([len(ids) for ids in hits], dtype=np.intp)
+        if hits:
+            ids = np.concatenate(hits)
+        else:
+            ids = np.empty(0, dtype=np.intp)
+        return self._bulk_result(positions, counts, ids)
+
+    def _bulk_result(self, positions, counts, ids):
+        result = np.empty((2, len(ids)), dtype=np.intp)
+        result[0] = np.repeat(positions, counts)
+        result[1] = ids
+        self._record('query', queries=len(positions), candidates=len(ids))
+        return result
+
+    def stats(self):
+        """
+        Return statistics on the structure and the use of the index.
+
+        Returns
+        -------
+        dict
+            - 'backend': the type of index ('rtree', 'grid' or 'filtered').
+            - 'size': the number of indexed geometries.
+            - 'node_count', 'leaf_count' and 'depth' of the tree (for the
+              grid, the leaves are the occupied cells).
+            - 'fill_factor': the average fraction of the capacity of the
+              leaves that is used (for the grid, the fraction of the cells
+              that is occupied).
+            - 'leaf_overlap': the summed area of the leaf bounds divided by
+              the area of the total bounds. Values much larger than 1 point
+              to heavily overlapping envelopes.
+            - 'build_time': seconds it took to build the index.
+            - 'queries': the number of queries.
+            - 'candidates': the number of entries returned by the queries.
+            - 'refined_candidates' and 'matches': the number of candidates
+              that were refined with an exact predicate, and the number of
+              those that matched.
+            - 'precision': matches / refined_candidates.
+            - 'bytes': the (estimated) memory used by the index.
+        """
+        stats = self._structure_stats()
+        stats['build_time'] = self._build_time
+        stats.update(self._get_counters())
+        if stats['refined_candidates']:
+            stats['precision'] = (
+                float(stats['matches']) / stats['refined_candidates'])
+        else:
+            stats['precision'] = np.nan
+        return stats
+
+
+class SpatialIndex(_IndexStats, RTreeIndex):
     """
     A simple wrapper around rtree's RTree Index
     """
@@ -13,13 +183,787 @@ class SpatialIndex(RTreeIndex):
         if not base.HAS_SINDEX:
             raise ImportError("SpatialIndex needs `rtree`")
         RTreeIndex.__init__(self, *args)
+        self._size = None
+        # compact copy of the entries (positions, bounds and the labels of
+        # all positions), kept when built by geopandas
+        self._ids = None
+        self._bounds = None
+        self._labels = None
+
+    def insert(self, id, coordinates, obj=None):
+        RTreeIndex.insert(self, id, coordinates, obj=obj)
+        if self._size is not None:
+            self._size += 1
+        self._ids = self._bounds = self._labels = None
+
+    add = insert
+
+    def delete(self, id, coordinates):
+        RTreeIndex.delete(self, id, coordinates)
+        self._size = None
+        self._ids = self._bounds = self._labels = None
+
+    def _state(self):
+        """The entries of the index as arrays, see ``_restore_sindex``"""
+        if self._ids is None:
+            items = list(RTreeIndex.intersection(
+                self, self.bounds, objects=True))
+            self._ids = np.array([item.id for item in items], dtype=np.intp)
+            self._bounds = np.array(
+                [item.bbox for item in items], dtype='float64').reshape(-1, 4)
+            self._labels = np.empty(
+                self._ids.max() + 1 if len(items) else 0, dtype=object)
+            self._labels[self._ids] = [item.object for item in items]
+        return {'backend': 'rtree', 'ids': self._ids, 'bounds': self._bounds}
+
+    def __reduce__(self):
+        return (_restore_sindex, (self._state(), self._labels))
+
+    def intersection(self, coordinates, objects=False):
+        return self._counted(
+            RTreeIndex.intersection(self, coordinates, objects=objects))
+
+    def nearest(self, coordinates, num_results=1, objects=False):
+        return self._counted(RTreeIndex.nearest(
+            self, coordinates, num_results=num_results, objects=objects))
+
+    def query_bulk(self, bounds):
+        if not hasattr(RTreeIndex, 'intersection_v'):
+            return _IndexStats.query_bulk(self, bounds)
+        # rtree >= 1.0 queries all boxes in a single call
+        bounds, positions = _valid_bounds(bounds)
+        ids, counts = self.intersection_v(
+            np.ascontiguousarray(bounds[:, :2]),
+            np.ascontiguousarray(bounds[:, 2:]))
+        return self._bulk_result(positions, counts, ids)
+
+    query_bulk.__doc__ = _IndexStats.query_bulk.__doc__
+
+    def _query_ids(self, bbox):
+        return np.fromiter(RTreeIndex.intersection(self, bbox),
+                           dtype=np.intp)
 
     @property
     def size(self):
-        return len(self.leaves()[0][1])
+        if self._size is None:
+            self._size = sum(len(leaf[1]) for leaf in self.leaves())
+        return self._size
 
     @property
     def is_empty(self):
-        if len(self.leaves()) > 1:
-            return False
         return self.size < 1
+
+    def dwithin(self, coordinates, distance, objects=False):
+        """
+        Return the entries whose bounds are within ``distance`` of the given
+        point or bounding box coordinates.
+
+        The returned entries are those with ``intersection`` semantics, so
+        objects can be True, False or 'raw'.
+        """
+        bbox = _as_bbox(coordinates)
+        hits = RTreeIndex.intersection(
+            self, _expand_bbox(bbox, distance), objects=True)
+        for item in self._counted(hits):
+            if _bbox_distance(item.bbox, bbox) <= distance:
+                if objects == 'raw':
+                    yield item.object
+                elif objects:
+                    yield item
+                else:
+                    yield item.id
+
+    def _structure_stats(self):
+        leaves = self.leaves()
+        properties = self.properties
+        n_leaves = len(leaves)
+        # the leaves are known, the number of internal nodes per level is
+        # derived from the node capacity
+        node_count = n_leaves
+        depth = 1
+        level = n_leaves
+        while level > 1:
+            level = int(np.ceil(float(level) / properties.index_capacity))
+            node_count += level
+            depth += 1
+        size = sum(len(leaf[1]) for leaf in leaves)
+        bounds = np.array([leaf[2] for leaf in leaves], dtype='float64')
+        if size:
+            leaf_area = ((bounds[:, 2] - bounds[:, 0])
+                         * (bounds[:, 3] - bounds[:, 1])).sum()
+            total_area = ((bounds[:, 2].max() - bounds[:, 0].min())
+                          * (bounds[:, 3].max() - bounds[:, 1].min()))
+            leaf_overlap = leaf_area / total_area if total_area else np.nan
+        else:
+            leaf_overlap = np.nan
+        # every entry stores its id and bounds, plus the pickled label
+        # (estimated from the first leaf)
+        entry_bytes = 8 + 4 * 8
+        if size:
+            item = next(RTreeIndex.intersection(
+                self, leaves[0][2], objects=True))
+            entry_bytes += len(pickle.dumps(item.object, protocol=2))
+        return {
+            'backend': 'rtree',
+            'size': size,
+            'node_count': node_count,
+            'leaf_count': n_leaves,
+            'depth': depth,
+            'fill_factor': (float(size) / (n_leaves * properties.leaf_capacity)
+                            if n_leaves else np.nan),
+            'leaf_overlap': leaf_overlap,
+            'bytes': (size * entry_bytes + node_count * 4 * 8
+                      + (self._ids.nbytes + self._bounds.nbytes
+                         if self._ids is not None else 0)),
+        }
+
+
+class SpatialIndexFuture(object):
+    """
+    Handle on the construction of a spatial index, as returned by
+    ``GeoDataFrame.build_sindex`` and ``GeoSeries.build_sindex``.
+
+    Parameters
+    ----------
+    func : callable, optional
+        Function building and returning the spatial index, which is run in
+        a background thread.
+    result : SpatialIndex, optional
+        The spatial index, if it is already available.
+    """
+
+    def __init__(self, func=None, result=None):
+        self._result = result
+        self._exc_info = None
+        self._thread = None
+        if func is not None:
+            self._thread = threading.Thread(target=self._run, args=(func,))
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _run(self, func):
+        try:
+            self._result = func()
+        except Exception:
+            self._exc_info = sys.exc_info()
+
+    def done(self):
+        """Return True if the construction of the spatial index finished."""
+        return self._thread is None or not self._thread.is_alive()
+
+    def result(self, timeout=None):
+        """
+        Wait for the construction to finish, and return the spatial index.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Maximum number of seconds to wait. A RuntimeError is raised if
+            the construction did not finish in time.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                raise RuntimeError("The spatial index is still being built")
+        if self._exc_info is not None:
+            six.reraise(*self._exc_info)
+        return self._result
+
+
+class _Item(object):
+    """Index entry returned by ``FilteredSpatialIndex`` queries"""
+
+    __slots__ = ('id', 'object', 'bounds')
+
+    def __init__(self, id, object, bounds):
+        self.id = id
+        self.object = object
+        self.bounds = bounds
+
+    @property
+    def bbox(self):
+        """Returns the bounding box of the index entry"""
+        minx, maxx, miny, maxy = self.bounds
+        return [minx, miny, maxx, maxy]
+
+
+def _item(i, label, bounds, objects):
+    """Format a query hit according to the ``objects`` query keyword"""
+    if objects == 'raw':
+        return label
+    elif objects:
+        return _Item(i, label, bounds)
+    return i
+
+
+class FilteredSpatialIndex(_IndexStats):
+    """
+    A read-only view on the spatial index of a parent object, restricted
+    to the rows of a subset of that object.
+
+    Queries are answered by the parent index, after which the hits are
+    mapped to the positions in the subset and the entries that are not part
+    of the subset are dropped. The ids and objects of the hits are the
+    integer positions and index labels of the subset, as for a freshly
+    built ``SpatialIndex``.
+
+    Parameters
+    ----------
+    parent : SpatialIndex
+        The spatial index of the object the subset was taken from.
+    positions : array of int
+        For each row of the subset, the position of its geometry in the
+        parent (-1 for missing geometries).
+    n_parent : int
+        The number of rows of the parent object.
+    labels : pandas.Index
+        The index of the subset.
+    """
+
+    def __init__(self, parent, positions, n_parent, labels):
+        self._parent = parent
+        self._positions = positions
+        self._n_parent = n_parent
+        self._labels = labels
+        self._lookup = np.full(n_parent, -1, dtype=np.intp)
+        valid = positions >= 0
+        self._lookup[positions[valid]] = np.arange(len(positions))[valid]
+        self._size = None
+
+    def intersection(self, coordinates, objects=False):
+        """
+        Return the entries of the subset whose bounds intersect the given
+        coordinates, as with ``rtree.index.Index.intersection``.
+        """
+        return self._counted(self._intersection(coordinates, objects))
+
+    def _intersection(self, coordinates, objects):
+        if objects:
+            hits = self._parent.intersection(coordinates, objects=True)
+            for item in hits:
+                i = self._lookup[item.id]
+                if i >= 0:
+                    yield _item(i, self._labels[i], item.bounds, objects)
+        else:
+            for j in self._parent.intersection(coordinates):
+                i = self._lookup[j]
+                if i >= 0:
+                    yield i
+
+    def query_bulk(self, bounds):
+        bounds, positions = _valid_bounds(bounds)
+        result = self._parent.query_bulk(bounds)
+        ids = self._lookup[result[1]]
+        keep = ids >= 0
+        counts = np.bincount(result[0][keep], minlength=len(bounds))
+        return self._bulk_result(positions, counts, ids[keep])
+
+    query_bulk.__doc__ = _IndexStats.query_bulk.__doc__
+
+    def dwithin(self, coordinates, distance, objects=False):
+        """
+        Return the entries of the subset whose bounds are within
+        ``distance`` of the given point or bounding box coordinates.
+        """
+        return self._counted(self._dwithin(coordinates, distance, objects))
+
+    def _dwithin(self, coordinates, distance, objects):
+        hits = self._parent.dwithin(coordinates, distance, objects=True)
+        for item in hits:
+            i = self._lookup[item.id]
+            if i >= 0:
+                yield _item(i, self._labels[i], item.bounds, objects)
+
+    def count(self, coordinates):
+        """
+        Return the number of entries of the subset whose bounds intersect
+        the given coordinates.
+        """
+        return sum(1 for _ in self.intersection(coordinates))
+
+    def nearest(self, coordinates, num_results=1, objects=False):
+        """
+        Return the ``num_results`` entries of the subset nearest to the
+        given coordinates, as with ``rtree.index.Index.nearest``.
+        """
+        return self._counted(self._nearest(coordinates, num_results, objects))
+
+    def _nearest(self, coordinates, num_results, objects):
+        n_parent = self._n_parent
+        # start from the number of parent hits expected to hold enough
+        # entries of the subset, and widen the search if it does not
+        fraction = max(float(len(self._positions)) / max(n_parent, 1), 1e-6)
+        n = int(np.ceil(num_results / fraction))
+        while True:
+            hits = list(self._parent.nearest(coordinates, n, objects=True))
+            found = [(self._lookup[item.id], item) for item in hits
+                     if self._lookup[item.id] >= 0]
+            if len(found) >= num_results or len(hits) < n or n >= n_parent:
+                break
+            n *= 2
+        if len(found) > num_results:
+            # keep the entries at the same distance as the last result
+            bbox = _as_bbox(coordinates)
+            last = _bbox_distance(found[num_results - 1][1].bbox, bbox)
+            found = found[:num_results] + [
+                hit for hit in found[num_results:]
+                if _bbox_distance(hit[1].bbox, bbox) <= last]
+        for i, item in found:
+            yield _item(i, self._labels[i], item.bounds, objects)
+
+    @property
+    def size(self):
+        if self._size is None:
+            ids = self._parent._state()['ids']
+            self._size = int((self._lookup[ids] >= 0).sum())
+        return self._size
+
+    @property
+    def is_empty(self):
+        return self.size < 1
+
+    def _state(self):
+        """
+        The entries of the subset as arrays of the parent index type, see
+        ``_restore_sindex``.
+        """
+        state = dict(self._parent._state())
+        keep = self._lookup[state['ids']] >= 0
+        for key in ['ids', 'bounds', 'codes', 'x', 'y']:
+            if key in state:
+                state[key] = state[key][keep]
+        state['ids'] = self._lookup[state['ids']]
+        return state
+
+    def __reduce__(self):
+        return (_restore_sindex, (self._state(), self._labels))
+
+    def _structure_stats(self):
+        stats = self._parent._structure_stats()
+        stats['parent_size'] = stats['size']
+        stats['size'] = self.size
+        stats['backend'] = 'filtered'
+        stats['bytes'] += self._positions.nbytes + self._lookup.nbytes
+        return stats
+
+
+class PointGridIndex(_IndexStats):
+    """
+    Spatial index specialised for point data, binning the points into the
+    cells of a uniform grid.
+
+    The cell size is chosen from the extent and the number of points, such
+    that a cell holds ``points_per_cell`` points on average. The points are
+    sorted by cell, so all points of a cell (and of consecutive cells in a
+    row of the grid) are found with a binary search, without storing a tree.
+
+    The query methods have the same signature and return the same entries
+    as those of ``SpatialIndex``: the ids are the integer positions and the
+    objects are the index labels of the points.
+
+    Parameters
+    ----------
+    x, y : array of float
+        The coordinates of the points, NaN for missing or empty points.
+    labels : pandas.Index
+        The index labels of the points.
+    points_per_cell : int, default 8
+        The average number of points per cell of the grid.
+    """
+
+    def __init__(self, x, y, labels, points_per_cell=8):
+        x = np.asarray(x, dtype='float64')
+        y = np.asarray(y, dtype='float64')
+        ids = np.nonzero(~(np.isnan(x) | np.isnan(y)))[0]
+        x = x[ids]
+        y = y[ids]
+        n = len(ids)
+        self._labels = labels
+
+        if n:
+            self._extent = (x.min(), y.min(), x.max(), y.max())
+        else:
+            self._extent = (0.0, 0.0, 0.0, 0.0)
+        xmin, ymin, xmax, ymax = self._extent
+        width = xmax - xmin
+        height = ymax - ymin
+        n_cells = max(n // points_per_cell, 1)
+        # the second term bounds the number of rows or columns for very
+        # elongated extents
+        cell = max(np.sqrt(width * height / n_cells),
+                   max(width, height) / n_cells)
+        if not cell > 0:
+            cell = 1.0
+        self._cell = cell
+        self._nx = int(width // cell) + 1
+        self._ny = int(height // cell) + 1
+
+        ix, iy = self._cell_of(x, y)
+        order = np.argsort(iy * self._nx + ix, kind='mergesort')
+        self._codes = (iy * self._nx + ix)[order]
+        self._ids = ids[order]
+        self._x = x[order]
+        self._y = y[order]
+
+    def _state(self):
+        """The arrays and grid parameters, see ``_restore_sindex``"""
+        return {'backend': 'grid', 'ids': self._ids, 'codes': self._codes,
+                'x': self._x, 'y': self._y, 'extent': self._extent,
+                'cell': self._cell, 'nx': self._nx, 'ny': self._ny}
+
+    @classmethod
+    def _from_state(cls, state, labels):
+        sindex = cls.__new__(cls)
+        sindex._labels = labels
+        for key in ['ids', 'codes', 'x', 'y', 'extent', 'cell', 'nx', 'ny']:
+            setattr(sindex, '_' + key, state[key])
+        return sindex
+
+    def __reduce__(self):
+        return (_restore_sindex, (self._state(), self._labels))
+
+    def _cell_of(self, x, y):
+        xmin, ymin = self._extent[:2]
+        ix = np.floor((np.asarray(x) - xmin) / self._cell)
+        iy = np.floor((np.asarray(y) - ymin) / self._cell)
+        ix = np.clip(ix, 0, self._nx - 1).astype(np.int64)
+        iy = np.clip(iy, 0, self._ny - 1).astype(np.int64)
+        return ix, iy
+
+    def _query(self, bbox):
+        """Positions (in sorted order) of the points inside ``bbox``"""
+        minx, miny, maxx, maxy = bbox
+        xmin, ymin, xmax, ymax = self._extent
+        if (not len(self._ids) or minx > xmax or maxx < xmin
+                or miny > ymax or maxy < ymin):
+            return np.empty(0, dtype=np.intp)
+        (ix0, ix1), (iy0, iy1) = self._cell_of([minx, maxx], [miny, maxy])
+        rows = np.arange(iy0, iy1 + 1, dtype=np.int64) * self._nx
+        starts = np.searchsorted(self._codes, rows + ix0, side='left')
+        ends = np.searchsorted(self._codes, rows + ix1, side='right')
+        k = _concat_ranges(starts, ends)
+        x = self._x[k]
+        y = self._y[k]
+        return k[(x >= minx) & (x <= maxx) & (y >= miny) & (y <= maxy)]
+
+    def _hits(self, k, objects):
+        k = k[np.argsort(self._ids[k], kind='mergesort')]
+        return self._counted(self._items(k, objects))
+
+    def _items(self, k, objects):
+        for i, x, y in zip(self._ids[k], self._x[k], self._y[k]):
+            yield _item(i, self._labels[i], [x, x, y, y], objects)
+
+    def intersection(self, coordinates, objects=False):
+        """
+        Return the points inside the given point or bounding box
+        coordinates, as with ``SpatialIndex.intersection``.
+        """
+        return self._hits(self._query(_as_bbox(coordinates)), objects)
+
+    def _query_ids(self, bbox):
+        return self._ids[self._query(bbox)]
+
+    def count(self, coordinates):
+        """Return the number of points inside the given coordinates."""
+        return len(self._query(_as_bbox(coordinates)))
+
+    def _distances(self, k, bbox):
+        minx, miny, maxx, maxy = bbox
+        x = self._x[k]
+        y = self._y[k]
+        dx = np.maximum(np.maximum(minx - x, x - maxx), 0)
+        dy = np.maximum(np.maximum(miny - y, y - maxy), 0)
+        return np.sqrt(dx * dx + dy * dy)
+
+    def _within(self, bbox, distance):
+        k = self._query(_expand_bbox(bbox, distance))
+        return k[self._distances(k, bbox) <= distance]
+
+    def dwithin(self, coordinates, distance, objects=False):
+        """
+        Return the points within ``distance`` of the given point or bounding
+        box coordinates.
+        """
+        return self._hits(self._within(_as_bbox(coordinates), distance),
+                          objects)
+
+    def nearest(self, coordinates, num_results=1, objects=False):
+        """
+        Return the ``num_results`` points nearest to the given point or
+        bounding box coordinates, ordered by distance. As with
+        ``rtree.index.Index.nearest``, points at the same distance as the
+        last result are all returned.
+        """
+        return self._counted(self._nearest(coordinates, num_results, objects))
+
+    def _nearest(self, coordinates, num_results, objects):
+        bbox = _as_bbox(coordinates)
+        n = len(self._ids)
+        if not n or num_results < 1:
+            return
+        num_results = min(num_results, n)
+        xmin, ymin, xmax, ymax = self._extent
+        # widen the search window until it holds enough points, after which
+        # the distance to the farthest of the nearest points of the window
+        # bounds the search radius
+        half = self._cell
+        while True:
+            k = self._query(_expand_bbox(bbox, half))
+            covers = (bbox[0] - half <= xmin and bbox[1] - half <= ymin
+                      and bbox[2] + half >= xmax and bbox[3] + half >= ymax)
+            if len(k) >= num_results or covers:
+                break
+            half *= 2
+        radius = np.partition(self._distances(k, bbox), num_results - 1)[
+            num_results - 1]
+        k = self._within(bbox, radius)
+        distances = self._distances(k, bbox)
+        order = np.lexsort((self._ids[k], distances))
+        # the window can hold more points than needed within the radius,
+        # only keep the ties with the last of the nearest points
+        distances = distances[order]
+        order = order[distances <= distances[num_results - 1]]
+        for hit in self._items(k[order], objects):
+            yield hit
+
+    @property
+    def size(self):
+        return len(self._ids)
+
+    @property
+    def is_empty(self):
+        return self.size < 1
+
+    def _structure_stats(self):
+        n_cells = (int((np.diff(self._codes) != 0).sum()) + 1
+                   if self.size else 0)
+        xmin, ymin, xmax, ymax = self._extent
+        total_area = (xmax - xmin) * (ymax - ymin)
+        return {
+            'backend': 'grid',
+            'size': self.size,
+            'node_count': n_cells,
+            'leaf_count': n_cells,
+            'depth': 1,
+            'fill_factor': float(n_cells) / (self._nx * self._ny),
+            'max_cell_size': (int(np.diff(np.r_[
+                0, np.nonzero(np.diff(self._codes))[0] + 1, self.size]).max())
+                if self.size else 0),
+            'leaf_overlap': (n_cells * self._cell ** 2 / total_area
+                             if total_area else np.nan),
+            'bytes': (self._codes.nbytes + self._ids.nbytes + self._x.nbytes
+                      + self._y.nbytes),
+        }
+
+
+def _as_bbox(coordinates):
+    """Bounding box (minx, miny, maxx, maxy) from point or box coordinates"""
+    if len(coordinates) == 2:
+        x, y = coordinates
+        return (x, y, x, y)
+    return tuple(coordinates)
+
+
+def _expand_bbox(bbox, distance):
+    minx, miny, maxx, maxy = bbox
+    return (minx - distance, miny - distance, maxx + distance, maxy + distance)
+
+
+def _bbox_distance(bbox1, bbox2):
+    """Minimum distance between two bounding boxes"""
+    dx = max(bbox1[0] - bbox2[2], bbox2[0] - bbox1[2], 0)
+    dy = max(bbox1[1] - bbox2[3], bbox2[1] - bbox1[3], 0)
+    return np.sqrt(dx * dx + dy * dy)
+
+
+def _valid_bounds(bounds):
+    """
+    The rows of the (n, 4) ``bounds`` array without NaN values, and their
+    positions.
+    """
+    bounds = np.asarray(bounds, dtype='float64').reshape(-1, 4)
+    positions = np.flatnonzero(~np.isnan(bounds).any(axis=1))
+    return bounds[positions], positions
+
+
+def _geometry_bounds(values):
+    """
+    The (n, 4) array of the bounds of the geometries in ``values``, with NaN
+    for missing and empty geometries.
+    """
+    bounds = np.full((len(values), 4), np.nan)
+    for i, geom in enumerate(values):
+        if isinstance(geom, BaseGeometry) and not geom.is_empty:
+            bounds[i] = geom.bounds
+    return bounds
+
+
+def _concat_ranges(starts, ends):
+    """Concatenation of ``np.arange(start, end)`` for all start/end pairs"""
+    lengths = ends - starts
+    total = lengths.sum()
+    if not total:
+        return np.empty(0, dtype=np.intp)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return np.arange(total, dtype=np.intp) + offsets
+
+
+def _build_point_grid(values, labels):
+    """
+    Build a ``PointGridIndex`` for ``values``, which should only hold
+    (possibly missing or empty) points.
+    """
+    start = time.time()
+    n = len(values)
+    x = np.full(n, np.nan)
+    y = np.full(n, np.nan)
+    for i, geom in enumerate(values):
+        if not isinstance(geom, BaseGeometry):
+            continue
+        if not isinstance(geom, Point):
+            raise ValueError(
+                "The 'grid' spatial index only supports Point geometries, "
+                "got a {0}".format(geom.geom_type))
+        try:
+            x[i], y[i] = geom.coords[0][:2]
+        except IndexError:
+            # empty point
+            pass
+    sindex = PointGridIndex(x, y, labels)
+    sindex._built(start)
+    return sindex
+
+
+def _build_sindex(values, labels):
+    """
+    Build a new spatial index for ``values``, storing the integer positions
+    as ids and ``labels`` as objects. Returns None if there are no
+    (non-empty) geometries to index.
+    """
+    start = time.time()
+    bounds, ids = _valid_bounds(_geometry_bounds(values))
+    sindex = _rtree_from_arrays(ids, bounds, labels)
+    if sindex is not None:
+        sindex._built(start)
+    return sindex
+
+
+def _rtree_from_arrays(ids, bounds, labels):
+    """
+    Bulk load a ``SpatialIndex`` from the positions and bounds of the
+    entries, with ``labels[i]`` the label of position i.
+    """
+    if not len(ids):
+        return None
+    stream = ((i, tuple(b), label) for i, b, label in
+              zip(ids.tolist(), bounds.tolist(), labels.take(ids)))
+    try:
+        sindex = SpatialIndex(stream)
+    # What we really want here is an empty generator error, or
+    # for the bulk loader to log that the generator was empty
+    # and move on. See https://github.com/Toblerity/rtree/issues/20.
+    except base.RTreeError:
+        return None
+    sindex._size = len(ids)
+    sindex._ids = ids
+    sindex._bounds = bounds
+    sindex._labels = labels
+    return sindex
+
+
+def _restore_sindex(state, labels):
+    """
+    Restore a spatial index from the arrays returned by its ``_state()``
+    method, used to pickle a spatial index (together with its GeoSeries or
+    GeoDataFrame) without having to recompute the bounds of the geometries.
+
+    Parameters
+    ----------
+    state : dict
+    labels : pandas.Index or array
+        The labels of all positions of the indexed object.
+    """
+    start = time.time()
+    if state['backend'] == 'grid':
+        sindex = PointGridIndex._from_state(state, labels)
+    elif not base.HAS_SINDEX:
+        warn("Cannot restore spatial index: Missing package `rtree`.")
+        return None
+    else:
+        sindex = _rtree_from_arrays(state['ids'], state['bounds'], labels)
+    if sindex is not None:
+        sindex._built(start)
+    return sindex
+
+
+def _subset_positions(values, source_values):
+    """
+    Find for each geometry in ``values`` the position of the identical
+    (same object) geometry in ``source_values``.
+
+    Missing geometries get position -1. Returns None if a geometry is not
+    present in ``source_values``, or if the same source position is used
+    more than once.
+    """
+    n_source = len(source_values)
+    # iterate in reverse so the first occurrence of a geometry object wins
+    lookup = dict(zip(map(id, source_values[::-1]),
+                      range(n_source - 1, -1, -1)))
+    positions = np.fromiter(
+        (lookup.get(id(geom), -2) if isinstance(geom, BaseGeometry) else -1
+         for geom in values), dtype=np.intp, count=len(values))
+    if (positions == -2).any():
+        return None
+    valid = positions[positions >= 0]
+    if len(np.unique(valid)) != len(valid):
+        return None
+    return positions
+
+
+def _derive_sindex(values, labels, source):
+    """
+    Derive the spatial index for ``values`` from the spatial index of the
+    object they were taken from.
+
+    Parameters
+    ----------
+    values : array of geometries
+    labels : pandas.Index
+        The index labels belonging to ``values``.
+    source : tuple of (sindex, values, labels)
+        The spatial index (or the ``SpatialIndexFuture`` building it),
+        geometries and index labels of the parent.
+
+    Returns
+    -------
+    SpatialIndex, FilteredSpatialIndex or None
+        The parent index itself if the rows are identical, a filtered view
+        on it, or None if the index can not be derived.
+    """
+    sindex, source_values, source_labels = source
+    if isinstance(sindex, SpatialIndexFuture):
+        sindex = sindex.result()
+        if sindex is None:
+            return None
+    start = time.time()
+    positions = _subset_positions(values, source_values)
+    if positions is None:
+        return None
+    n_source = len(source_values)
+    if n_source == len(values) and labels.equals(source_labels):
+        # the rows can only differ by geometries missing in both
+        moved = np.flatnonzero(positions != np.arange(n_source))
+        if (positions[moved] < 0).all() and all(
+                not isinstance(source_values[i], BaseGeometry)
+                or source_values[i].is_empty for i in moved):
+            return sindex
+    if isinstance(sindex, FilteredSpatialIndex):
+        # map directly onto the underlying index instead of stacking views
+        positions = np.where(
+            positions >= 0, sindex._positions[positions], positions)
+        n_source = sindex._n_parent
+        sindex = sindex._parent
+    sindex = FilteredSpatialIndex(sindex, positions, n_source, labels)
+    sindex._build_time = time.time() - start
+    return sindex
@@ -4,9 +4,10 @@ import pytest
 
 import numpy as np
 import pandas as pd
+from shapely.geometry import box
 
 import geopandas
-from geopandas import GeoDataFrame, read_file
+from geopandas import GeoDataFrame, GeoSeries, read_file
 
 from pandas.util.testing import assert_frame_equal
 
@@ -100,3 +101,47 @@ def test_reset_index(nybb_polydf, first):
     test = nybb_polydf.dissolve('manhattan_bronx', as_index=False)
     comparison = first.reset_index()
     assert_frame_equal(comparison, test, check_column_type=False)
+
+
+def test_dissolve_n_jobs(nybb_polydf, first):
+    test = nybb_polydf.dissolve('manhattan_bronx', n_jobs=2)
+    assert test.geom_almost_equals(first).all()
+    assert_frame_equal(first.drop(columns='myshapes'),
+                       test.drop(columns='myshapes'),
+                       check_column_type=False)
+
+
+def test_dissolve_missing_keys(nybb_polydf):
+    nybb_polydf.loc[0, 'manhattan_bronx'] = np.nan
+    test = nybb_polydf.dissolve('manhattan_bronx')
+    expected = [nybb_polydf.geometry[1:3].unary_union,
+                nybb_polydf.geometry[3:5].unary_union]
+    assert list(test.index) == [5, 6]
+    assert test.geom_almost_equals(GeoSeries(expected, index=[5, 6])).all()
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_coverage_dissolve(n_jobs):
+    # a ring of squares around a hole, two adjacent squares, squares with a
+    # vertex on the edge of another one and overlapping squares
+    groups = [
+        [box(0, 0, 3, 1), box(0, 2, 3, 3), box(0, 1, 1, 2), box(2, 1, 3, 2)],
+        [box(10, 0, 11, 1), box(11, 0, 12, 1), box(20, 20, 21, 21)],
+        [box(0, 10, 2, 11), box(0, 11, 1, 12), box(1, 11, 2, 12)],
+        [box(10, 10, 12, 12), box(11, 11, 13, 13)],
+    ]
+    df = GeoDataFrame(
+        {'group': [i for i, geoms in enumerate(groups) for _ in geoms]},
+        geometry=[geom for geoms in groups for geom in geoms])
+    expected = df.dissolve('group')
+    test = df.dissolve('group', method='coverage', n_jobs=n_jobs)
+    assert test.geom_equals(expected).all()
+    assert test.geometry.is_valid.all()
+    assert test.geometry[0].type == 'Polygon'
+    assert len(test.geometry[0].interiors) == 1
+    assert test.geometry[1].type == 'MultiPolygon'
+
+
+def test_dissolve_bad_method(nybb_polydf):
+    with pytest.raises(ValueError):
+        nybb_polydf.dissolve('manhattan_bronx', method='bad')
@@ -602,6 +602,24 @@ class TestGeomMethods:
         expected_df = expected_df.set_index(expected_index)
         assert_frame_equal(test_df, expected_df)
 
+    def test_explode_index_parts(self):
+        s = GeoSeries([MultiPoint([(0, 0), (1, 1)]), Point(2, 2), None],
+                      index=['a', 'b', 'c'], crs={'init': 'epsg:4326'})
+        expected = GeoSeries([Point(0, 0), Point(1, 1), Point(2, 2), None],
+                             index=['a', 'a', 'b', 'c'],
+                             crs={'init': 'epsg:4326'})
+        assert_geoseries_equal(expected, s.explode(index_parts=False))
+
+        df = GeoDataFrame({'geometry': s, 'col': [1, 2, 3]},
+                          columns=['geometry', 'col'])
+        test_df = df.explode(index_parts=False)
+        expected_df = GeoDataFrame({'geometry': expected,
+                                    'col': [1, 1, 2, 3]},
+                                   columns=['geometry', 'col'],
+                                   crs={'init': 'epsg:4326'})
+        assert_frame_equal(test_df, expected_df)
+        assert test_df.crs == df.crs
+
     #
     # Test '&', '|', '^', and '-'
     # The left can only be a GeoSeries. The right hand side can be a
@@ -201,6 +201,21 @@ class TestSeries:
         assert geom_equals(gs.cx[0:, :], gs.loc[3:])
         assert geom_equals(gs.cx[:, 0:], gs.loc[3:])
 
+    def test_coord_slice_partial_overlap(self):
+        gs = GeoSeries([Point(1, 1), LineString([(0, 5), (5, 0)]),
+                        LineString([(0, 4), (1, 4)]),
+                        Polygon([(2, 2), (3, 2), (3, 3)]), None,
+                        Polygon()])
+        # the envelope of the diagonal line overlaps the box, not the line
+        assert geom_equals(gs.cx[:2, :2], gs.iloc[[0, 3]])
+        assert geom_equals(gs.cx[2:, :], gs.iloc[[1, 3]])
+        assert geom_equals(gs.cx[:, 4:], gs.iloc[1:3])
+        assert geom_equals(gs.cx[3:2.5, :], gs.iloc[[1, 3]])
+        if gs.sindex is not None:
+            assert gs.has_sindex
+            assert geom_equals(gs.cx[:2, :2], gs.iloc[[0, 3]])
+            assert geom_equals(gs.cx[:, 4:], gs.iloc[1:3])
+
     def test_geoseries_geointerface(self):
         assert self.g1.__geo_interface__['type'] == 'FeatureCollection'
         assert len(self.g1.__geo_interface__['features']) == self.g1.shape[0]
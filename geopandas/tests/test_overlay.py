@@ -4,7 +4,7 @@ import os
 from distutils.version import LooseVersion
 
 import pandas as pd
-from shapely.geometry import Point, Polygon
+from shapely.geometry import LineString, Point, Polygon
 
 import geopandas
 from geopandas import GeoDataFrame, GeoSeries, read_file, overlay
@@ -81,7 +81,6 @@ def test_overlay(dfs_index, how, use_sindex):
             expected_intersection,
             expected_difference
         ], ignore_index=True, **CONCAT_KWARGS)
-        expected['col1'] = expected['col1'].astype(float)
     else:
         expected = _read(how)
 
@@ -143,6 +142,8 @@ def test_overlay_nybb(how):
 
     if how == 'identity':
         expected = expected[expected.BoroCode.notnull()].copy()
+        # all rows have a borough, so its code remains an integer
+        expected['BoroCode'] = expected['BoroCode'].astype('int64')
 
     # Order GeoDataFrames
     expected = expected.sort_values(cols).reset_index(drop=True)
@@ -320,3 +321,163 @@ def test_correct_index(dfs):
                             columns=['col3', 'col2', 'geometry'])
     result = overlay(df3, df2)
     assert_geodataframe_equal(result, expected)
+
+
+def test_difference_many_neighbours():
+    # a polygon cut by a grid of (also touching or disjoint) squares
+    df1 = GeoDataFrame(
+        {'col1': [1, 2]},
+        geometry=[Point(5, 5).buffer(4.5), Point(20, 20).buffer(1)])
+    squares = [Polygon([(x, y), (x + 0.5, y), (x + 0.5, y + 0.5),
+                        (x, y + 0.5)])
+               for x in range(10) for y in range(10)]
+    df2 = GeoDataFrame({'col2': range(len(squares))}, geometry=squares)
+    result = overlay(df1, df2, how='difference')
+    expected = [df1.geometry[0].difference(GeoSeries(squares).unary_union),
+                df1.geometry[1]]
+    assert list(result['col1']) == [1, 2]
+    for geom, exp in zip(result.geometry, expected):
+        assert geom.is_valid
+        assert geom.symmetric_difference(exp).area < 1e-9
+
+
+@pytest.mark.parametrize('n_jobs, tile_size', [(2, None), (1, 1), (2, 1)])
+def test_overlay_n_jobs(dfs, how, n_jobs, tile_size):
+    df1, df2 = dfs
+    result = overlay(df1, df2, how=how, n_jobs=n_jobs, tile_size=tile_size)
+    assert_geodataframe_equal(result, overlay(df1, df2, how=how))
+
+
+def test_bad_tile_size(dfs):
+    df1, df2 = dfs
+    with pytest.raises(ValueError):
+        overlay(df1, df2, tile_size=0)
+
+
+def test_make_valid(how):
+    # a self-intersecting bowtie, of which buffer(0) keeps one triangle
+    bowtie = Polygon([(0, 0), (2, 2), (2, 0), (0, 2)])
+    df1 = GeoDataFrame({'col1': [1, 2]},
+                       geometry=[bowtie, Point(3, 3).buffer(1)])
+    df2 = GeoDataFrame({'col2': [1]}, geometry=[Point(1, 1).buffer(1.5)])
+
+    result, stats = overlay(df1, df2, how=how, return_stats=True)
+    assert stats == {'checked': 3, 'repaired': 1}
+    assert result.geometry.is_valid.all()
+    repaired = df1.copy()
+    repaired['geometry'] = df1.geometry.buffer(0)
+    expected = overlay(repaired, df2, how=how)
+    assert_geodataframe_equal(result, expected)
+
+    with pytest.raises(ValueError):
+        overlay(df1, df2, how=how, make_valid=False)
+
+    result, stats = overlay(repaired, df2, how=how, make_valid=False,
+                            return_stats=True)
+    assert stats == {'checked': 0, 'repaired': 0}
+    assert_geodataframe_equal(result, expected)
+
+
+def test_intersection_touching():
+    # the intersections of touching polygons are only lines or points
+    df1 = GeoDataFrame({'col1': [1, 2]},
+                       geometry=[Polygon([(0, 0), (1, 0), (1, 1), (0, 1)]),
+                                 Polygon([(0, 0), (2, 0), (2, 2), (0, 2)])])
+    df2 = GeoDataFrame({'col2': [1]},
+                       geometry=[Polygon([(1, 0), (3, 0), (3, 2), (1, 2)])])
+    result = overlay(df1, df2, how='intersection')
+    assert list(result['col1']) == [2]
+    assert result.geom_type.tolist() == ['Polygon']
+    assert result.geometry[0].area == 2
+
+
+def test_overlay_iter(dfs, how):
+    df1, df2 = dfs
+    expected = overlay(df1, df2, how=how)
+    parts = list(geopandas.overlay_iter(df1, df2, how=how, tile_size=1))
+    assert len(parts) > 1
+    result = pd.concat(parts)
+    assert result.index.is_unique
+    if how != 'difference':
+        assert list(result.index) == list(range(len(result)))
+    columns = [col for col in expected.columns if col != 'geometry']
+    result = result.sort_values(columns).reset_index(drop=True)
+    expected = expected.sort_values(columns).reset_index(drop=True)
+    assert_geodataframe_equal(result, expected, check_dtype=False,
+                              check_less_precise=True)
+
+
+@pytest.mark.parametrize('driver, ext', [('ESRI Shapefile', 'shp'),
+                                         ('GeoJSON', 'geojson')])
+def test_overlay_to_file(tmpdir, dfs, how, driver, ext):
+    df1, df2 = dfs
+    filename = os.path.join(str(tmpdir), 'overlay.' + ext)
+    count = geopandas.overlay_to_file(df1, df2, how, filename,
+                                      driver=driver, tile_size=1)
+    expected = overlay(df1, df2, how=how)
+    assert count == len(expected)
+    result = read_file(filename)
+    columns = [col for col in expected.columns if col != 'geometry']
+    assert list(result.columns) == columns + ['geometry']
+    result = result.sort_values(columns).reset_index(drop=True)
+    expected = expected.sort_values(columns).reset_index(drop=True)
+    assert_geoseries_equal(result.geometry, expected.geometry,
+                           check_crs=False, check_less_precise=True)
+
+
+@pytest.mark.parametrize('how', ['intersection', 'identity', 'difference'])
+def test_overlay_lines_points(how):
+    polygons = GeoDataFrame(
+        {'col2': [1, 2]},
+        geometry=[Polygon([(0, 0), (4, 0), (4, 4), (0, 4)]),
+                  Polygon([(10, 0), (14, 0), (14, 4), (10, 4)])])
+    # inside, crossing the boundary, disjoint
+    lines = GeoDataFrame(
+        {'col1': [1, 2, 3]},
+        geometry=[LineString([(1, 1), (3, 3)]), LineString([(2, 2), (6, 2)]),
+                  LineString([(6, 6), (8, 8)])])
+    points = GeoDataFrame({'col1': [1, 2, 3]},
+                          geometry=[Point(1, 1), Point(4, 2), Point(6, 6)])
+    expected_geoms = {
+        'intersection': ([lines.geometry[0], LineString([(2, 2), (4, 2)])],
+                         [points.geometry[0], points.geometry[1]]),
+        'identity': ([lines.geometry[0], LineString([(2, 2), (4, 2)]),
+                      LineString([(4, 2), (6, 2)]), lines.geometry[2]],
+                     [points.geometry[0], points.geometry[1],
+                      points.geometry[2]]),
+        'difference': ([LineString([(4, 2), (6, 2)]), lines.geometry[2]],
+                       [points.geometry[2]]),
+    }[how]
+    expected_col1 = {
+        'intersection': ([1, 2], [1, 2]),
+        'identity': ([1, 2, 2, 3], [1, 2, 3]),
+        'difference': ([2, 3], [3]),
+    }[how]
+    for df, geoms, col1 in zip([lines, points], expected_geoms,
+                               expected_col1):
+        result = overlay(df, polygons, how=how)
+        assert list(result['col1']) == col1
+        assert_geoseries_equal(result.geometry,
+                               GeoSeries(geoms, index=result.index))
+        if how != 'difference':
+            # the features inside the polygons are passed through
+            assert result.geometry.values[0] is df.geometry.values[0]
+
+
+def test_keep_geom_type():
+    df1 = GeoDataFrame({'col1': [1]},
+                       geometry=[Polygon([(0, 0), (2, 0), (2, 2), (0, 2)])])
+    df2 = GeoDataFrame({'col2': [1, 2]},
+                       geometry=[Polygon([(2, 0), (4, 0), (4, 2), (2, 2)]),
+                                 Polygon([(1, 1), (3, 1), (3, 3), (1, 3)])])
+    result = overlay(df1, df2, how='intersection')
+    assert result.geom_type.tolist() == ['Polygon']
+    result = overlay(df1, df2, how='intersection', keep_geom_type=False)
+    assert result.geom_type.tolist() == ['LineString', 'Polygon']
+
+
+def test_raise_mixed_dimensions(dfs):
+    polydf, _ = dfs
+    mixed = GeoDataFrame(geometry=[Point(0, 0), polydf.geometry[0]])
+    with pytest.raises(TypeError):
+        overlay(mixed, polydf)
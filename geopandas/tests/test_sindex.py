@@ -1,9 +1,15 @@
+import copy
+import pickle
 import sys
 
+import numpy as np
 from shapely.geometry import Polygon, Point
 
 import geopandas
 from geopandas import GeoSeries, GeoDataFrame, base, read_file
+from geopandas.sindex import (
+    SpatialIndex, FilteredSpatialIndex, PointGridIndex, add_stats_hook,
+    remove_stats_hook)
 
 import pytest
 
@@ -76,6 +82,36 @@ class TestFrameSindex:
         assert self.df.sindex.size == 5
         assert self.df._sindex is not None
 
+    def test_has_sindex(self):
+        assert not self.df.has_sindex
+        assert self.df.sindex is not None
+        assert self.df.has_sindex
+        assert self.df[self.df['A'] > 0].has_sindex
+        self.df.set_geometry([Point(0, 0)] * 5, inplace=True)
+        assert not self.df.has_sindex
+
+    def test_build_sindex(self):
+        future = self.df.build_sindex()
+        assert future.done()
+        assert future.result() is self.df.sindex
+
+    def test_build_sindex_background(self):
+        future = self.df.build_sindex(background=True)
+        assert self.df.build_sindex(background=True) is future
+        sindex = future.result(timeout=10)
+        assert future.done()
+        assert sindex.size == 5
+        assert self.df.sindex is sindex
+
+    def test_build_sindex_background_invalidated(self):
+        self.df.build_sindex(background=True)
+        self.df.set_geometry(
+            [Point(x, y) for x, y in zip(range(5, 10), range(5, 10))],
+            inplace=True)
+        assert self.df._sindex_build is None
+        hits = list(self.df.sindex.intersection((5, 5, 6, 6)))
+        assert hits == [0, 1]
+
     def test_sindex_rebuild_on_set_geometry(self):
         # First build the sindex
         assert self.df.sindex is not None
@@ -85,6 +121,313 @@ class TestFrameSindex:
         assert self.df._sindex_generated is False
 
 
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="fails on AppVeyor")
+@pytest.mark.skipif(not base.HAS_SINDEX, reason='Rtree absent, skipping')
+class TestSubsetSindex:
+    def setup_method(self):
+        data = {"A": range(10),
+                "geometry": [Point(x, x) for x in range(10)]}
+        self.df = GeoDataFrame(data, index=list('abcdefghij'))
+        # build the index of the parent
+        assert self.df.sindex is not None
+
+    def test_copy_shares_index(self):
+        assert self.df.copy().sindex is self.df.sindex
+        assert self.df.geometry.sindex is self.df.sindex
+
+    def test_mask(self):
+        subset = self.df[self.df['A'] % 2 == 0]
+        assert isinstance(subset.sindex, FilteredSpatialIndex)
+        assert subset.sindex.size == 5
+        hits = list(subset.sindex.intersection((1.5, 1.5, 4.5, 4.5)))
+        assert hits == [1, 2]
+        hits = subset.sindex.intersection((1.5, 1.5, 4.5, 4.5), objects=True)
+        assert [hit.object for hit in hits] == ['c', 'e']
+        assert list(subset.sindex.nearest((5.1, 5.1), 1)) == [3]
+
+    def test_iloc_loc_cx(self):
+        for subset in [self.df.iloc[::-1], self.df.loc[['j', 'b', 'c']],
+                       self.df.cx[2:, :], self.df.geometry.iloc[3:]]:
+            fresh = GeoSeries(list(subset.geometry), index=subset.index)
+            for bounds in [(1.5, 1.5, 4.5, 4.5), (-1, -1, 20, 20)]:
+                hits = subset.sindex.intersection(bounds, objects=True)
+                expected = fresh.sindex.intersection(bounds, objects=True)
+                assert (sorted((h.id, h.object) for h in hits)
+                        == sorted((h.id, h.object) for h in expected))
+
+    def test_subset_of_subset(self):
+        subset = self.df.iloc[1:][1:]
+        assert isinstance(subset.sindex, FilteredSpatialIndex)
+        assert isinstance(subset.sindex._parent, SpatialIndex)
+        assert list(subset.sindex.intersection((2, 2, 3, 3))) == [0, 1]
+
+    def test_small_subset_builds_new_index(self):
+        subset = self.df.iloc[:2]
+        assert isinstance(subset.sindex, SpatialIndex)
+        assert subset.sindex.size == 2
+
+    def test_changed_geometries(self):
+        subset = self.df.iloc[1:].copy()
+        subset['geometry'] = [Point(x, x) for x in range(9)]
+        assert isinstance(subset.sindex, SpatialIndex)
+        assert list(subset.sindex.intersection((0, 0, 0, 0))) == [0]
+
+    def test_missing_geometries(self):
+        df = GeoDataFrame({"geometry": [None, Point(0, 0), None, Point(1, 1)]})
+        assert df.sindex is not None
+        subset = df.iloc[1:]
+        assert isinstance(subset.sindex, FilteredSpatialIndex)
+        assert list(subset.sindex.intersection((0, 0, 1, 1))) == [0, 2]
+        # missing in the parent as well, so its index is used as is
+        assert df.copy().sindex is df.sindex
+
+    def test_missing_in_subset(self):
+        s = self.df.geometry
+        subset = s.where(s.index != 'b')
+        assert subset.sindex is not s.sindex
+        assert sorted(subset.sindex.intersection((0, 0, 2, 2))) == [0, 2]
+
+
+@pytest.mark.skipif(not base.HAS_SINDEX, reason='Rtree absent, skipping')
+class TestSindexStats:
+    def setup_method(self):
+        self.s = GeoSeries([Point(x, y) for x in range(20) for y in range(20)])
+
+    def test_size(self):
+        assert self.s.sindex.size == 400
+        assert not self.s.sindex.is_empty
+        assert self.s.sindex.stats()['size'] == 400
+        sindex = self.s.sindex
+        sindex._size = None
+        assert sindex.size == 400
+        sindex.insert(400, (0, 0, 0, 0))
+        assert sindex.size == 401
+
+    def test_structure(self):
+        stats = self.s.sindex.stats()
+        assert stats['backend'] == 'rtree'
+        assert stats['leaf_count'] > 1
+        assert stats['node_count'] > stats['leaf_count']
+        assert stats['depth'] == 2
+        assert 0 < stats['fill_factor'] <= 1
+        assert stats['leaf_overlap'] > 0
+        assert stats['build_time'] >= 0
+        assert stats['bytes'] > 400 * 40
+
+    def test_counters(self):
+        sindex = self.s.sindex
+        assert len(list(sindex.intersection((0, 0, 1, 1)))) == 4
+        assert len(list(sindex.nearest((0, 0), 1))) == 1
+        sindex.record_refinement(4, 1)
+        stats = sindex.stats()
+        assert stats['queries'] == 2
+        assert stats['candidates'] == 5
+        assert stats['refined_candidates'] == 4
+        assert stats['matches'] == 1
+        assert stats['precision'] == 0.25
+
+    def test_filtered_and_grid(self):
+        self.s.sindex
+        stats = self.s[self.s.x < 10].sindex.stats()
+        assert stats['backend'] == 'filtered'
+        assert stats['size'] == 200
+        assert stats['parent_size'] == 400
+        self.s.build_sindex(backend='grid')
+        stats = self.s.sindex.stats()
+        assert stats['backend'] == 'grid'
+        assert stats['size'] == 400
+        assert stats['max_cell_size'] >= 1
+        assert stats['bytes'] == 400 * 32
+
+    def test_hook(self):
+        events = []
+
+        def hook(sindex, event, counts):
+            events.append((event, counts))
+
+        add_stats_hook(hook)
+        try:
+            list(self.s.sindex.intersection((0, 0, 1, 1)))
+        finally:
+            remove_stats_hook(hook)
+        list(self.s.sindex.intersection((0, 0, 1, 1)))
+        assert [event for event, _ in events] == ['build', 'query']
+        assert events[0][1]['size'] == 400
+        assert events[1][1] == {'queries': 1, 'candidates': 4}
+
+
+class TestPointGridIndex:
+    def setup_method(self):
+        points = [Point(x, y) for x, y in zip(range(10), range(10))]
+        self.s = GeoSeries(points + [None, Point()],
+                           index=list('abcdefghijkl'))
+        self.s.build_sindex(backend='grid')
+
+    def test_build(self):
+        assert isinstance(self.s.sindex, PointGridIndex)
+        assert self.s.sindex.size == 10
+        assert not self.s.sindex.is_empty
+        assert isinstance(GeoSeries([]).build_sindex(backend='grid').result(),
+                          PointGridIndex)
+
+    def test_build_background(self):
+        s = GeoSeries([Point(0, 0), Point(1, 1)])
+        sindex = s.build_sindex(background=True, backend='grid').result()
+        assert isinstance(sindex, PointGridIndex)
+        assert s.sindex is sindex
+
+    def test_intersection(self):
+        hits = self.s.sindex.intersection((2.5, 2.5, 4, 4))
+        assert list(hits) == [3, 4]
+        hits = self.s.sindex.intersection((2, 2), objects=True)
+        hit, = list(hits)
+        assert (hit.id, hit.object, hit.bbox) == (2, 'c', [2, 2, 2, 2])
+        assert self.s.sindex.count((-1, -1, 20, 20)) == 10
+        assert list(self.s.sindex.intersection((20, 20, 30, 30))) == []
+
+    def test_dwithin(self):
+        hits = self.s.sindex.dwithin((4, 4), 1.5, objects='raw')
+        assert list(hits) == ['d', 'e', 'f']
+
+    def test_nearest(self):
+        assert list(self.s.sindex.nearest((4.2, 4.1), 2)) == [4, 5]
+        # ties are all returned
+        assert list(self.s.sindex.nearest((4.5, 4.5), 1)) == [4, 5]
+        assert list(self.s.sindex.nearest((100, 100), 1)) == [9]
+
+    @pytest.mark.parametrize('num_results', [1, 3, 10])
+    def test_nearest_brute_force(self, num_results):
+        rng = np.random.RandomState(0)
+        # a dense cluster in sparse points, rounded to have ties
+        xy = np.concatenate([rng.normal(0, 0.05, size=(300, 2)),
+                             rng.uniform(-50, 50, size=(300, 2))]).round(2)
+        s = GeoSeries([Point(x, y) for x, y in xy])
+        sindex = s.build_sindex(backend='grid').result()
+        for qx, qy in rng.uniform(-50, 50, size=(200, 2)):
+            dx, dy = xy[:, 0] - qx, xy[:, 1] - qy
+            distances = np.sqrt(dx * dx + dy * dy)
+            order = np.lexsort((np.arange(len(xy)), distances))
+            last = distances[order[num_results - 1]]
+            expected = order[distances[order] <= last]
+            result = list(sindex.nearest((qx, qy), num_results))
+            assert len(result) == len(expected)
+            assert result == list(expected)
+
+    @pytest.mark.skipif(not base.HAS_SINDEX, reason='Rtree absent, skipping')
+    def test_subset(self):
+        subset = self.s[::2]
+        assert isinstance(subset.sindex, FilteredSpatialIndex)
+        assert list(subset.sindex.intersection((0, 0, 4, 4))) == [0, 1, 2]
+        assert list(subset.sindex.nearest((3, 3), 1)) == [1, 2]
+        assert subset.sindex.size == 5
+
+    def test_non_points(self):
+        s = GeoSeries([Point(0, 0), Polygon([(0, 0), (1, 0), (1, 1)])])
+        with pytest.raises(ValueError, match="only supports Point"):
+            s.build_sindex(backend='grid')
+        with pytest.raises(ValueError, match="Unknown spatial index backend"):
+            s.build_sindex(backend='quadtree')
+
+
+@pytest.mark.skipif(not base.HAS_SINDEX, reason='Rtree absent, skipping')
+class TestQueryBulk:
+    def setup_method(self):
+        self.s = GeoSeries([Point(x, x) for x in range(10)])
+        self.bounds = np.array([[0, 0, 1.5, 1.5],
+                                [np.nan] * 4,
+                                [20, 20, 30, 30],
+                                [8.5, 8.5, 9, 9]])
+
+    def check(self, sindex, expected):
+        result = sindex.query_bulk(self.bounds)
+        order = np.lexsort((result[1], result[0]))
+        assert result[:, order].tolist() == expected
+
+    def test_rtree(self):
+        self.check(self.s.sindex, [[0, 0, 3], [0, 1, 9]])
+        assert self.s.sindex.stats()['queries'] == 3
+        assert self.s.sindex.stats()['candidates'] == 3
+
+    def test_grid(self):
+        self.s.build_sindex(backend='grid')
+        self.check(self.s.sindex, [[0, 0, 3], [0, 1, 9]])
+
+    def test_filtered(self):
+        self.s.sindex
+        subset = self.s[1:]
+        assert isinstance(subset.sindex, FilteredSpatialIndex)
+        self.check(subset.sindex, [[0, 3], [0, 8]])
+
+    def test_empty(self):
+        result = self.s.sindex.query_bulk(np.empty((0, 4)))
+        assert result.shape == (2, 0)
+
+
+@pytest.mark.skipif(not base.HAS_SINDEX, reason='Rtree absent, skipping')
+class TestPickleSindex:
+    def setup_method(self):
+        data = {"A": range(10),
+                "geometry": [Point(x, x) for x in range(10)]}
+        self.df = GeoDataFrame(data, index=list('abcdefghij'))
+
+    def test_pickle_frame(self):
+        assert self.df.sindex is not None
+        result = pickle.loads(pickle.dumps(self.df))
+        assert result._sindex_state is not None
+        assert not result._sindex_generated
+        hits = result.sindex.intersection((0, 0, 2, 2), objects=True)
+        hits = sorted(hits, key=lambda item: item.id)
+        assert [item.id for item in hits] == [0, 1, 2]
+        assert [item.object for item in hits] == ['a', 'b', 'c']
+        assert result._sindex_state is None
+
+    def test_pickle_series(self):
+        s = self.df.geometry
+        s.build_sindex(backend='grid')
+        result = pickle.loads(pickle.dumps(s))
+        assert isinstance(result.sindex, PointGridIndex)
+        assert list(result.sindex.intersection((0, 0, 2, 2))) == [0, 1, 2]
+
+    def test_pickle_without_index(self):
+        result = pickle.loads(pickle.dumps(self.df))
+        assert result._sindex_state is None
+        assert result.sindex.size == 10
+
+    def test_pickle_index(self):
+        sindex = pickle.loads(pickle.dumps(self.df.sindex))
+        assert isinstance(sindex, SpatialIndex)
+        assert sorted(sindex.intersection((0, 0, 2, 2))) == [0, 1, 2]
+        subset = pickle.loads(pickle.dumps(self.df[::2].sindex))
+        assert list(subset.intersection((0, 0, 4, 4))) == [0, 1, 2]
+
+    def test_copy(self):
+        sindex = self.df.sindex
+        assert self.df.copy(deep=False).sindex is sindex
+        assert copy.deepcopy(self.df).sindex is sindex
+        assert copy.deepcopy(self.df.geometry).sindex is sindex
+
+    def test_copy_edited(self):
+        assert self.df.sindex is not None
+        df = self.df.copy()
+        df.loc['b', 'geometry'] = Point(20, 20)
+        assert sorted(df.sindex.intersection((0, 0, 2, 2))) == [0, 2]
+        assert list(df.sindex.intersection((19, 19, 21, 21))) == [1]
+        s = self.df.geometry.copy()
+        s['b'] = Point(20, 20)
+        assert sorted(s.sindex.intersection((0, 0, 2, 2))) == [0, 2]
+        assert list(s.sindex.intersection((19, 19, 21, 21))) == [1]
+        # the index of the original is unaffected
+        assert sorted(self.df.sindex.intersection((0, 0, 2, 2))) == [0, 1, 2]
+
+    def test_copy_background(self):
+        self.df.build_sindex(background=True)
+        df = self.df.copy()
+        df.loc['b', 'geometry'] = Point(20, 20)
+        assert list(df.sindex.intersection((19, 19, 21, 21))) == [1]
+        assert df.sindex is not self.df.sindex
+        assert self.df.copy().sindex is self.df.sindex
+
+
 # Skip to accommodate Shapely geometries being unhashable
 @pytest.mark.skip
 class TestJoinSindex:
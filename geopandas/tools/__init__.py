@@ -1,14 +1,23 @@
 from __future__ import absolute_import
 
+from .clip import clip
 from .geocoding import geocode, reverse_geocode
-from .overlay import overlay
-from .sjoin import sjoin
+from .overlay import overlay, overlay_iter, overlay_to_file
+from .sjoin import (
+    SpatialJoiner, sjoin, sjoin_aggregate, sjoin_iter, sjoin_nearest)
 from .util import collect
 from .crs import explicit_crs_from_epsg
 
 __all__ = [
+    'clip',
     'overlay',
+    'overlay_iter',
+    'overlay_to_file',
     'sjoin',
+    'sjoin_aggregate',
+    'sjoin_iter',
+    'sjoin_nearest',
+    'SpatialJoiner',
     'geocode',
     'reverse_geocode',
     'collect',
@@ -0,0 +1,94 @@
+from warnings import warn
+
+import numpy as np
+from shapely import prepared
+from shapely.geometry.base import BaseGeometry
+
+from geopandas import GeoDataFrame, GeoSeries
+from geopandas.sindex import _geometry_bounds
+from geopandas.tools.overlay import _DIMENSIONS, _extract
+
+
+def clip(gdf, mask, keep_geom_type=False):
+    """Clip the geometries of a GeoDataFrame or GeoSeries to a mask.
+
+    Only the rows that intersect the mask are kept, with their geometries
+    cut to the mask. The candidate rows are found with the spatial index of
+    ``gdf``; geometries in the interior of the mask are kept as they are,
+    and only those crossing its boundary are intersected with it.
+
+    Parameters
+    ----------
+    gdf : GeoDataFrame or GeoSeries
+    mask : Polygon, MultiPolygon, GeoDataFrame or GeoSeries
+        The area to clip to. The geometries of a GeoDataFrame or GeoSeries
+        should be polygons, which are combined in a single mask.
+    keep_geom_type : bool, default False
+        If True, only the parts of the clipped geometries with the dimension
+        of the original geometries are kept (e.g. not the points where a
+        line touches the boundary of the mask).
+
+    Returns
+    -------
+    GeoDataFrame or GeoSeries
+        The clipped rows of ``gdf``, in their original order and with their
+        index.
+
+    Examples
+    --------
+    >>> roads_nyc = geopandas.clip(roads, boroughs)  # doctest: +SKIP
+    """
+    if not isinstance(gdf, (GeoDataFrame, GeoSeries)):
+        raise TypeError("'gdf' should be a GeoDataFrame or GeoSeries, got "
+                        "{0}".format(type(gdf)))
+    if isinstance(mask, (GeoDataFrame, GeoSeries)):
+        if mask.crs != gdf.crs:
+            warn('CRS of the mask does not match! (%s != %s)'
+                 % (gdf.crs, mask.crs))
+        if not mask.geom_type.isin(['Polygon', 'MultiPolygon']).all():
+            raise TypeError("clip only takes masks with (multi)polygon "
+                            "geometries.")
+        mask = mask.unary_union
+    elif (not isinstance(mask, BaseGeometry) or not mask.is_empty
+            and mask.type not in ['Polygon', 'MultiPolygon']):
+        raise TypeError("'mask' should be a (multi)polygon, GeoDataFrame or "
+                        "GeoSeries, got {0}".format(type(mask)))
+
+    geoms = gdf.geometry.values
+    if mask is None or mask.is_empty:
+        candidates = np.empty(0, dtype=np.intp)
+    else:
+        sindex = gdf.sindex
+        if sindex is not None:
+            _, candidates = sindex.query_bulk(np.array([mask.bounds]))
+            candidates = np.sort(candidates)
+        else:
+            bounds = _geometry_bounds(geoms)
+            minx, miny, maxx, maxy = mask.bounds
+            candidates = np.flatnonzero(
+                (bounds[:, 0] <= maxx) & (bounds[:, 1] <= maxy)
+                & (bounds[:, 2] >= minx) & (bounds[:, 3] >= miny))
+
+    prepared_mask = prepared.prep(mask) if len(candidates) else None
+    clipped = np.empty(len(candidates), dtype=object)
+    keep = np.zeros(len(candidates), dtype=bool)
+    for k, i in enumerate(candidates):
+        geom = geoms[i]
+        if prepared_mask.contains_properly(geom):
+            clipped[k] = geom
+        elif prepared_mask.intersects(geom):
+            clipped[k] = geom.intersection(mask)
+            if keep_geom_type:
+                clipped[k] = _extract(clipped[k], _DIMENSIONS.get(geom.type))
+        else:
+            continue
+        keep[k] = not clipped[k].is_empty
+
+    rows = candidates[keep]
+    clipped = GeoSeries(clipped[keep], index=gdf.index[rows], crs=gdf.crs)
+    if isinstance(gdf, GeoSeries):
+        clipped.name = gdf.name
+        return clipped
+    result = gdf.iloc[rows].copy()
+    result[result._geometry_column_name] = clipped
+    return result
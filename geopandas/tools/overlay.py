@@ -1,13 +1,20 @@
+import multiprocessing
+import os
 import warnings
-from functools import reduce
 from distutils.version import LooseVersion
 
+import fiona
 import numpy as np
 import pandas as pd
 from shapely.ops import unary_union, polygonize
-from shapely.geometry import MultiLineString
+from shapely.geometry import GeometryCollection, MultiLineString, Polygon
 
 from geopandas import GeoDataFrame, GeoSeries
+from geopandas.io.file import _FIONA18, fiona_env, infer_schema
+from geopandas.sindex import _geometry_bounds
+from geopandas.tools.sjoin import (
+    _add_suffix, _parallel_pairs, _prepared, _query_pairs, _spatial_order,
+    _take)
 
 
 if str(pd.__version__) < LooseVersion('0.23'):
@@ -15,6 +22,13 @@ if str(pd.__version__) < LooseVersion('0.23'):
 else:
     CONCAT_KWARGS = {'sort': False}
 
+# the dimensions of the geometry types taken by overlay
+_DIMENSIONS = {
+    'Point': 0, 'MultiPoint': 0,
+    'LineString': 1, 'MultiLineString': 1, 'LinearRing': 1,
+    'Polygon': 2, 'MultiPolygon': 2,
+}
+
 
 def _uniquify(columns):
     ucols = []
@@ -189,142 +203,392 @@ def _overlay_old(df1, df2, how, use_sindex=True, **kwargs):
     return GeoDataFrame(collection, index=range(len(collection)))
 
 
-def _ensure_geometry_column(df):
-    """
-    Helper function to ensure the geometry column is called 'geometry'.
-    If another column with that name exists, it will be dropped.
+def _overlay(df1, df2, how, n_jobs=1, tile_size=None, dim=None):
     """
-    if not df._geometry_column_name == 'geometry':
-        if 'geometry' in df.columns:
-            df.drop('geometry', axis=1, inplace=True)
-        df.rename(columns={df._geometry_column_name: 'geometry'},
-                  copy=False, inplace=True)
-        df.set_geometry('geometry', inplace=True)
-
+    Overlay operation used in overlay function (except for 'difference').
 
-def _overlay_intersection(df1, df2):
+    The spatial index is queried once for the pairs of intersecting
+    geometries, from which only the pieces needed for ``how`` are computed:
+    the intersections of the pairs, and the remainders of the geometries of
+    ``df1`` and/or ``df2`` that are not covered by the other frame.
     """
-    Overlay Intersection operation used in overlay function
+    kinds, idx1, idx2, geoms = [], [], [], []
+    for kind, part1, part2, part in _overlay_parts(df1, df2, how, n_jobs,
+                                                   tile_size, dim):
+        kinds.append(np.full(len(part), kind, np.intp))
+        idx1.append(part1)
+        idx2.append(part2)
+        geoms.append(part)
+    if not kinds:
+        empty = np.empty(0, dtype=np.intp)
+        return _overlay_frame(df1, df2, empty, empty, [])
+    kinds, idx1, idx2, geoms = [
+        np.concatenate(part) for part in [kinds, idx1, idx2, geoms]]
+    # the intersections, followed by the remainders of df1 and of df2
+    order = np.lexsort((idx2, idx1, kinds))
+    return _overlay_frame(df1, df2, idx1[order], idx2[order], geoms[order])
+
+
+def _overlay_parts(df1, df2, how, n_jobs=1, tile_size=None, dim=None):
     """
-    # Spatial Index to create intersections
-    spatial_index = df2.sindex
-    bbox = df1.geometry.apply(lambda x: x.bounds)
-    sidx = bbox.apply(lambda x: list(spatial_index.intersection(x)))
-    # Create pairs of geometries in both dataframes to be intersected
-    nei = []
-    for i, j in enumerate(sidx):
-        for k in j:
-            nei.append([i, k])
-    if nei != []:
-        pairs = pd.DataFrame(nei, columns=['__idx1', '__idx2'])
-        left = df1.geometry.take(pairs['__idx1'].values)
-        left.reset_index(drop=True, inplace=True)
-        right = df2.geometry.take(pairs['__idx2'].values)
-        right.reset_index(drop=True, inplace=True)
-        intersections = left.intersection(right).buffer(0)
-
-        # only keep actual intersecting geometries
-        pairs_intersect = pairs[~intersections.is_empty]
-        geom_intersect = intersections[~intersections.is_empty]
-
-        # merge data for intersecting geometries
-        df1 = df1.reset_index(drop=True)
-        df2 = df2.reset_index(drop=True)
-        dfinter = pairs_intersect.merge(
-            df1.drop(df1._geometry_column_name, axis=1),
-            left_on='__idx1', right_index=True)
-        dfinter = dfinter.merge(
-            df2.drop(df2._geometry_column_name, axis=1),
-            left_on='__idx2', right_index=True, suffixes=['_1', '_2'])
-
-        return GeoDataFrame(dfinter, geometry=geom_intersect, crs=df1.crs)
+    Yields the non-empty pieces of the overlay as they are computed, as
+    ``(kind, idx1, idx2, geoms)``, with ``kind`` 0 for the intersections of
+    the rows at the positions ``idx1`` and ``idx2``, and 1 and 2 for the
+    remainders of the rows of ``df1`` and ``df2`` (``idx2`` and ``idx1`` are
+    -1). Only the parts of dimension ``dim`` of the intersections are kept,
+    unless None.
+
+    The rows are split in spatially compact partitions of ``tile_size``
+    rows, which are computed by ``n_jobs`` worker processes if larger than 1
+    (-1 to use all CPUs).
+    """
+    if n_jobs == -1:
+        n_jobs = multiprocessing.cpu_count()
+    if n_jobs > 1:
+        idx1, idx2 = _parallel_pairs(df1, df2, 'intersects', n_jobs)
+    else:
+        idx1, idx2 = _query_pairs(df1, df2, 'intersects')
+    geoms1 = df1.geometry.values
+    geoms2 = df2.geometry.values
+
+    intersect = how in ['intersection', 'union', 'identity']
+    tasks = [(1, task) for task in _overlay_tasks(
+        geoms1, geoms2, idx1, idx2, intersect, how != 'intersection', dim,
+        n_jobs, tile_size)]
+    if how in ['symmetric_difference', 'union']:
+        tasks.extend(
+            (2, task) for task in _overlay_tasks(
+                geoms2, geoms1, idx2, idx1, False, True, dim, n_jobs,
+                tile_size))
+
+    pool = None
+    if n_jobs > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(n_jobs)
+        results = pool.imap(_overlay_tile, [task for _, (_, _, _, task)
+                                            in tasks])
     else:
-        return GeoDataFrame(
-            [],
-            columns=list(set(df1.columns).union(df2.columns)) + ['__idx1', '__idx2'],
-            crs=df1.crs)
+        results = (_overlay_tile(task) for _, (_, _, _, task) in tasks)
+    try:
+        for (kind, (rows, idx, other_idx, _)), (intersections, differences) \
+                in zip(tasks, results):
+            if intersections is not None:
+                intersections = _geometry_array(intersections)
+                keep = ~_is_empty(intersections)
+                if keep.any():
+                    yield (0, idx[keep], other_idx[keep],
+                           intersections[keep])
+            if differences is not None:
+                differences = _geometry_array(differences)
+                keep = ~_is_empty(differences)
+                if keep.any():
+                    missing = np.full(keep.sum(), -1, np.intp)
+                    if kind == 1:
+                        yield 1, rows[keep], missing, differences[keep]
+                    else:
+                        yield 2, missing, rows[keep], differences[keep]
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+def _overlay_frame(df1, df2, idx1, idx2, geoms):
+    """
+    The overlay result with the geometries ``geoms`` and the attributes of
+    the rows at the positions ``idx1`` of ``df1`` and ``idx2`` of ``df2``
+    (missing for the positions -1).
+    """
+    # the geometry columns, and other columns named 'geometry', are
+    # replaced by the resulting geometries
+    columns1 = [i for i, col in enumerate(df1.columns)
+                if col not in [df1._geometry_column_name, 'geometry']]
+    columns2 = [i for i, col in enumerate(df2.columns)
+                if col not in [df2._geometry_column_name, 'geometry']]
+    if not len(geoms):
+        names = list(df1.columns[columns1]) + list(df2.columns[columns2])
+        return GeoDataFrame([], columns=names + ['geometry'], crs=df1.crs)
+    part1 = _take(df1, idx1, columns1)
+    part2 = _take(df2, idx2, columns2)
+    # as in a merge, suffixes are added to the names in both frames
+    duplicates = set(part1.columns) & set(part2.columns)
+    part1.columns = _add_suffix(part1.columns, duplicates, '1')
+    part2.columns = _add_suffix(part2.columns, duplicates, '2')
+    result = pd.concat([part1, part2], axis=1, copy=False)
+    return GeoDataFrame(result, geometry=GeoSeries(geoms, crs=df1.crs),
+                        crs=df1.crs)
+
+
+def _geometry_array(geoms):
+    """The list of geometries ``geoms`` as an object array"""
+    values = np.empty(len(geoms), dtype=object)
+    for i, geom in enumerate(geoms):
+        values[i] = geom
+    return values
+
+
+def _is_empty(geoms):
+    return np.array([geom.is_empty for geom in geoms], dtype=bool)
+
+
+def _extract(geom, dim):
+    """
+    The parts of dimension ``dim`` of ``geom`` (an empty geometry if there
+    are none).
+    """
+    if _DIMENSIONS.get(geom.type) == dim:
+        return geom
+    if geom.type == 'GeometryCollection':
+        parts = [part for part in geom.geoms
+                 if _DIMENSIONS.get(part.type) == dim]
+        if len(parts) == 1:
+            return parts[0]
+        if parts:
+            return unary_union(parts)
+    return GeometryCollection()
+
+
+def _dimension(df):
+    """
+    The dimension of the geometries of ``df`` (None if it has no rows),
+    which should all be points, lines or polygons.
+    """
+    dims = set(_DIMENSIONS.get(geom_type) for geom_type in df.geom_type)
+    if None in dims:
+        raise TypeError("overlay only takes GeoDataFrames with (multi)point, "
+                        "(multi)linestring or (multi)polygon geometries.")
+    if len(dims) > 1:
+        raise TypeError("overlay does not support GeoDataFrames with "
+                        "geometries of mixed dimensions.")
+    return dims.pop() if dims else None
 
 
-def _overlay_difference(df1, df2):
+def _make_valid(df, stats):
+    """
+    ``df`` with its invalid geometries repaired with ``buffer(0)``, updating
+    the counters in ``stats``.
+    """
+    invalid = np.flatnonzero(~df.geometry.is_valid.values)
+    stats['checked'] += len(df)
+    stats['repaired'] += len(invalid)
+    if not len(invalid):
+        return df
+    geoms = df.geometry.values.copy()
+    for i in invalid:
+        geoms[i] = geoms[i].buffer(0)
+    df = df.copy()
+    df[df._geometry_column_name] = GeoSeries(geoms, index=df.index,
+                                             crs=df.crs)
+    return df
+
+
+def _overlay_difference(df1, df2, n_jobs=1, tile_size=None):
     """
     Overlay Difference operation used in overlay function
     """
-    # Spatial Index to create intersections
-    spatial_index = df2.sindex
-    bbox = df1.geometry.apply(lambda x: x.bounds)
-    sidx = bbox.apply(lambda x: list(spatial_index.intersection(x)))
-    # Create differences
-    new_g = []
-    for geom, neighbours in zip(df1.geometry, sidx):
-        new = reduce(lambda x, y: x.difference(y).buffer(0),
-                     [geom] + list(df2.geometry.iloc[neighbours]))
-        new_g.append(new)
-    differences = GeoSeries(new_g, index=df1.index)
-    geom_diff = differences[~differences.is_empty].copy()
-    dfdiff = df1[~differences.is_empty].copy()
-    dfdiff[dfdiff._geometry_column_name] = geom_diff
+    differences = np.empty(len(df1), dtype=object)
+    keep = np.zeros(len(df1), dtype=bool)
+    for _, idx, _, geoms in _overlay_parts(df1, df2, 'difference', n_jobs,
+                                           tile_size):
+        differences[idx] = geoms
+        keep[idx] = True
+    dfdiff = df1[keep].copy()
+    dfdiff[dfdiff._geometry_column_name] = GeoSeries(
+        differences[keep], index=dfdiff.index, crs=df1.crs)
     return dfdiff
 
 
-def _overlay_symmetric_diff(df1, df2):
+def _overlay_tasks(geoms, other_geoms, idx, other_idx, intersect, subtract,
+                   dim=None, n_jobs=1, tile_size=None):
     """
-    Overlay Symmetric Difference operation used in overlay function
+    Splits the rows of ``geoms`` in spatially compact partitions of
+    ``tile_size`` rows, following a Z-order curve through the centers of
+    their bounds (by default a few partitions per worker).
+
+    Returns a list with for every partition its rows, its pairs of
+    intersecting positions ``(idx, other_idx)``, sorted, and the task for
+    ``_overlay_tile``, which only holds the geometries of the partition.
     """
-    dfdiff1 = _overlay_difference(df1, df2)
-    dfdiff2 = _overlay_difference(df2, df1)
-    dfdiff1['__idx1'] = range(len(dfdiff1))
-    dfdiff2['__idx2'] = range(len(dfdiff2))
-    dfdiff1['__idx2'] = np.nan
-    dfdiff2['__idx1'] = np.nan
-    # ensure geometry name (otherwise merge goes wrong)
-    _ensure_geometry_column(dfdiff1)
-    _ensure_geometry_column(dfdiff2)
-    # combine both 'difference' dataframes
-    dfsym = dfdiff1.merge(dfdiff2, on=['__idx1', '__idx2'], how='outer',
-                          suffixes=['_1', '_2'])
-    geometry = dfsym.geometry_1.copy()
-    geometry[dfsym.geometry_1.isnull()] = \
-        dfsym.loc[dfsym.geometry_1.isnull(), 'geometry_2']
-    dfsym.drop(['geometry_1', 'geometry_2'], axis=1, inplace=True)
-    dfsym.reset_index(drop=True, inplace=True)
-    dfsym = GeoDataFrame(dfsym, geometry=geometry, crs=df1.crs)
-    return dfsym
-
-
-def _overlay_union(df1, df2):
+    if not len(geoms):
+        return []
+    if tile_size is None:
+        tile_size = int(np.ceil(len(geoms) / (4.0 * n_jobs)))
+    order = _spatial_order(_geometry_bounds(geoms))
+    partitions = np.empty(len(geoms), dtype=np.intp)
+    partitions[order] = np.arange(len(geoms)) // tile_size
+    pair_order = np.lexsort((other_idx, idx, partitions[idx]))
+    idx, other_idx = idx[pair_order], other_idx[pair_order]
+    n_partitions = partitions.max() + 1
+    starts = np.searchsorted(partitions[idx], np.arange(n_partitions + 1))
+
+    tasks = []
+    for i in range(n_partitions):
+        start, end = starts[i], starts[i + 1]
+        if not subtract and start == end:
+            continue
+        rows = np.sort(order[i * tile_size:(i + 1) * tile_size])
+        others, local_other_idx = np.unique(other_idx[start:end],
+                                            return_inverse=True)
+        task = (geoms[rows], other_geoms[others],
+                np.searchsorted(rows, idx[start:end]), local_other_idx,
+                intersect, subtract, dim)
+        tasks.append((rows, idx[start:end], other_idx[start:end], task))
+    return tasks
+
+
+def _overlay_tile(task):
     """
-    Overlay Union operation used in overlay function
+    The intersections of the pairs of geometries of a partition, and the
+    differences of its geometries and the union of the other geometries
+    they intersect (None if not requested).
+
+    The geometries that lie in the interior of another geometry are passed
+    through untouched, and only the others are cut.
+    """
+    geoms, other_geoms, idx, other_idx, intersect, subtract, dim = task
+    prepared_others = {}
+    intersections = differences = None
+    if intersect:
+        intersections = []
+        for i, j in zip(idx, other_idx):
+            geom = geoms[i]
+            if _prepared(prepared_others, other_geoms, j).contains_properly(
+                    geom):
+                intersections.append(geom)
+                continue
+            intersection = geom.intersection(other_geoms[j])
+            if dim is not None:
+                # the inputs are valid, so the intersections only hold
+                # lower-dimensional pieces where the geometries touch
+                intersection = _extract(intersection, dim)
+            intersections.append(intersection)
+    if subtract:
+        positions = np.arange(len(geoms))
+        starts = np.searchsorted(idx, positions)
+        ends = np.searchsorted(idx, positions, side='right')
+        differences = []
+        for geom, start, end in zip(geoms, starts, ends):
+            if any(_prepared(prepared_others, other_geoms, j)
+                   .contains_properly(geom) for j in other_idx[start:end]):
+                differences.append(GeometryCollection())
+            else:
+                differences.append(
+                    _difference(geom, other_geoms[other_idx[start:end]]))
+    return intersections, differences
+
+
+def _difference(geom, neighbours):
+    """
+    The difference of a geometry and the union of its neighbours, repaired
+    with ``buffer(0)`` only if that is not valid.
     """
-    dfinter = _overlay_intersection(df1, df2)
-    dfsym = _overlay_symmetric_diff(df1, df2)
-    dfunion = pd.concat([dfinter, dfsym], ignore_index=True, **CONCAT_KWARGS)
-    # keep geometry column last
-    columns = list(dfunion.columns)
-    columns.remove('geometry')
-    columns = columns + ['geometry']
-    return dfunion.reindex(columns=columns)
+    if not len(neighbours):
+        return geom
+    if len(neighbours) == 1:
+        other = neighbours[0]
+    else:
+        other = unary_union(list(neighbours))
+    difference = geom.difference(other)
+    if difference.type in ['Polygon', 'MultiPolygon'] \
+            and not difference.is_valid:
+        difference = difference.buffer(0)
+    return difference
 
 
-def overlay(df1, df2, how='intersection', make_valid=True, use_sindex=None):
-    """Perform spatial overlay between two polygons.
+def _prepare_overlay(df1, df2, how, make_valid, tile_size):
+    """
+    Checks the arguments of the overlay and returns the frames with the
+    invalid polygons repaired if ``make_valid``, the dimension of the
+    geometries of ``df1``, and the counters of the checked and repaired
+    geometries.
+    """
+    # Allowed operations
+    allowed_hows = [
+        'intersection',
+        'union',
+        'identity',
+        'symmetric_difference',
+        'difference',  # aka erase
+    ]
+    # Error Messages
+    if how not in allowed_hows:
+        raise ValueError("`how` was '{0}' but is expected to be "
+                         "in %s".format(how, allowed_hows))
+
+    if isinstance(df1, GeoSeries) or isinstance(df2, GeoSeries):
+        raise NotImplementedError("overlay currently only implemented for "
+                                  "GeoDataFrames")
+
+    if tile_size is not None and tile_size < 1:
+        raise ValueError("'tile_size' should be a positive number of rows, "
+                         "got {0}".format(tile_size))
+
+    dim1 = _dimension(df1)
+    dim2 = _dimension(df2)
+    if how in ['union', 'symmetric_difference'] and (
+            dim1 not in [None, 2] or dim2 not in [None, 2]):
+        raise TypeError("overlay with how='{0}' only takes GeoDataFrames "
+                        "with (multi)polygon geometries.".format(how))
+
+    # only polygons can be invalid in ways that buffer(0) repairs
+    stats = {'checked': 0, 'repaired': 0}
+    if make_valid:
+        if dim1 == 2:
+            df1 = _make_valid(df1, stats)
+        if dim2 == 2:
+            df2 = _make_valid(df2, stats)
+    elif ((dim1 == 2 and not df1.geometry.is_valid.all())
+            or (dim2 == 2 and not df2.geometry.is_valid.all())):
+        raise ValueError("overlay only takes valid geometries when "
+                         "make_valid=False.")
+
+    return df1, df2, dim1, stats
+
+
+def overlay(df1, df2, how='intersection', make_valid=True, use_sindex=None,
+            n_jobs=1, tile_size=None, return_stats=False,
+            keep_geom_type=True):
+    """Perform spatial overlay between two GeoDataFrames.
 
-    Currently only supports data GeoDataFrames with polygons.
     Implements several methods that are all effectively subsets of
-    the union.
+    the union. The geometries of each frame should all be (multi)points,
+    (multi)linestrings or (multi)polygons, and 'union' and
+    'symmetric_difference' only take (multi)polygons.
 
     Parameters
     ----------
-    df1 : GeoDataFrame with MultiPolygon or Polygon geometry column
-    df2 : GeoDataFrame with MultiPolygon or Polygon geometry column
+    df1 : GeoDataFrame
+    df2 : GeoDataFrame
     how : string
         Method of spatial overlay: 'intersection', 'union',
         'identity', 'symmetric_difference' or 'difference'.
+    make_valid : bool, default True
+        If True, the validity of the polygons is checked and only the
+        invalid ones are repaired with ``buffer(0)``. If False, a ValueError
+        is raised for invalid polygons.
+    n_jobs : int, default 1
+        The number of worker processes that find the intersecting pairs of
+        geometries and compute their intersections and differences (-1 to
+        use all CPUs).
+    tile_size : int, optional
+        The number of rows of the spatially compact partitions of each frame
+        that are computed together, following a Z-order curve through the
+        centers of their bounds. By default a few partitions per worker.
+    return_stats : bool, default False
+        If True, also return a dict with the number of input geometries whose
+        validity was checked ('checked') and that were repaired
+        ('repaired').
+    keep_geom_type : bool, default True
+        If True, only the parts of the intersections with the dimension of
+        the geometries of ``df1`` are kept (e.g. not the lines where two
+        polygons touch). If False, all the intersections are kept.
 
     Returns
     -------
     df : GeoDataFrame
-        GeoDataFrame with new set of polygons and attributes
+        GeoDataFrame with new set of geometries and attributes
         resulting from the overlay
+    stats : dict
+        Only returned if ``return_stats`` is True.
 
     """
     if use_sindex is not None:
@@ -332,46 +596,159 @@ def overlay(df1, df2, how='intersection', make_valid=True, use_sindex=None):
                       "always requires a spatial index (rtree).",
                       DeprecationWarning, stacklevel=2)
 
-    # Allowed operations
-    allowed_hows = [
-        'intersection',
-        'union',
-        'identity',
-        'symmetric_difference',
-        'difference',  # aka erase
-    ]
-    # Error Messages
-    if how not in allowed_hows:
-        raise ValueError("`how` was '{0}' but is expected to be "
-                         "in %s".format(how, allowed_hows))
+    df1, df2, dim, stats = _prepare_overlay(df1, df2, how, make_valid,
+                                            tile_size)
 
-    if isinstance(df1, GeoSeries) or isinstance(df2, GeoSeries):
-        raise NotImplementedError("overlay currently only implemented for "
-                                  "GeoDataFrames")
+    # Computations
+    if how == 'difference':
+        result = _overlay_difference(df1, df2, n_jobs, tile_size)
+    else:
+        result = _overlay(df1, df2, how, n_jobs, tile_size,
+                          dim if keep_geom_type else None)
+    if return_stats:
+        return result, stats
+    return result
 
-    accepted_types = ['Polygon', 'MultiPolygon']
-    if (not df1.geom_type.isin(accepted_types).all()
-            or not df2.geom_type.isin(accepted_types).all()):
-        raise TypeError("overlay only takes GeoDataFrames with (multi)polygon "
-                        " geometries.")
 
-    # Computations
-    df1 = df1.copy()
-    df2 = df2.copy()
-    df1[df1._geometry_column_name] = df1.geometry.buffer(0)
-    df2[df2._geometry_column_name] = df2.geometry.buffer(0)
+def overlay_iter(df1, df2, how='intersection', make_valid=True, n_jobs=1,
+                 tile_size=None, keep_geom_type=True):
+    """Spatial overlay of two GeoDataFrames, yielding the result in parts.
 
+    The parts are yielded as soon as the spatially compact partitions of
+    ``tile_size`` rows of the frames they come from are computed, so the
+    full result never has to be held in memory.
+
+    Parameters
+    ----------
+    df1 : GeoDataFrame
+    df2 : GeoDataFrame
+    how : string, default 'intersection'
+        Method of spatial overlay, see ``overlay``.
+    make_valid : bool, default True
+        See ``overlay``.
+    n_jobs : int, default 1
+        See ``overlay``.
+    tile_size : int, optional
+        See ``overlay``.
+    keep_geom_type : bool, default True
+        See ``overlay``.
+
+    Yields
+    ------
+    GeoDataFrame
+        The parts of the result. Together they hold the same rows as the
+        result of ``overlay``, in another order, and numbered consecutively
+        (except for 'difference', which keeps the index of ``df1``).
+    """
+    df1, df2, dim, _ = _prepare_overlay(df1, df2, how, make_valid,
+                                        tile_size)
+    return _overlay_batches(df1, df2, how, n_jobs, tile_size,
+                            dim if keep_geom_type else None)
+
+
+def _overlay_batches(df1, df2, how, n_jobs, tile_size, dim):
+    start = 0
+    for _, idx1, idx2, geoms in _overlay_parts(df1, df2, how, n_jobs,
+                                               tile_size, dim):
+        if how == 'difference':
+            batch = df1.iloc[idx1].copy()
+            batch[batch._geometry_column_name] = GeoSeries(
+                geoms, index=batch.index, crs=df1.crs)
+        else:
+            batch = _overlay_frame(df1, df2, idx1, idx2, geoms)
+            batch.index = pd.RangeIndex(start, start + len(batch))
+        start += len(batch)
+        yield batch
+
+
+def overlay_to_file(df1, df2, how, filename, driver="ESRI Shapefile",
+                    make_valid=True, n_jobs=1, tile_size=None,
+                    keep_geom_type=True, **kwargs):
+    """Spatial overlay of two GeoDataFrames, written to an OGR data source.
+
+    The parts of the result (see ``overlay_iter``) are written as soon as
+    they are computed, so the full result never has to be held in memory.
+    Columns that can have missing values in the result are written with
+    the type they have with missing values.
+
+    Parameters
+    ----------
+    df1 : GeoDataFrame
+    df2 : GeoDataFrame
+    how : string
+        Method of spatial overlay, see ``overlay``.
+    filename : string
+        File path to write to.
+    driver : string, default 'ESRI Shapefile'
+        The OGR format driver used to write the vector file.
+    make_valid : bool, default True
+        See ``overlay``.
+    n_jobs : int, default 1
+        See ``overlay``.
+    tile_size : int, optional
+        See ``overlay``. Smaller partitions limit the memory used.
+    keep_geom_type : bool, default True
+        See ``overlay``. If False, the geometry type of the layer is
+        'Unknown'.
+
+    The *kwargs* are passed to fiona.open.
+
+    Returns
+    -------
+    int
+        The number of features written.
+
+    Examples
+    --------
+    >>> overlay_to_file(parcels, land_cover, 'intersection',
+    ...                 'parcel_cover.shp', tile_size=10000)  # doctest: +SKIP
+    """
+    df1, df2, dim, _ = _prepare_overlay(df1, df2, how, make_valid,
+                                        tile_size)
+    if not keep_geom_type:
+        dim = None
+    schema = _overlay_schema(df1, df2, how, dim)
+    filename = os.path.abspath(os.path.expanduser(filename))
+    count = 0
+    with fiona_env():
+        with fiona.open(filename, 'w', driver=driver, crs=df1.crs,
+                        schema=schema, **kwargs) as colxn:
+            for batch in _overlay_batches(df1, df2, how, n_jobs, tile_size,
+                                          dim):
+                colxn.writerecords(batch.iterfeatures())
+                count += len(batch)
+    return count
+
+
+def _overlay_schema(df1, df2, how, dim):
+    """
+    The schema of the result of the overlay, from a template with a row for
+    every combination of (missing) attributes the result can have, and
+    with the geometry types of dimension ``dim`` (any if None).
+    """
     if how == 'difference':
-        return _overlay_difference(df1, df2)
-    elif how == 'intersection':
-        result = _overlay_intersection(df1, df2)
-    elif how == 'symmetric_difference':
-        result = _overlay_symmetric_diff(df1, df2)
-    elif how == 'union':
-        result = _overlay_union(df1, df2)
-    elif how == 'identity':
-        dfunion = _overlay_union(df1, df2)
-        result = dfunion[dfunion['__idx1'].notnull()].copy()
-    result.reset_index(drop=True, inplace=True)
-    result.drop(['__idx1', '__idx2'], axis=1, inplace=True)
-    return result
+        columns = [i for i, col in enumerate(df1.columns)
+                   if col != df1._geometry_column_name]
+        template = _take(df1, np.array([0 if len(df1) else -1]), columns)
+    else:
+        idx1, idx2 = {
+            'intersection': ([0], [0]),
+            'identity': ([0, 0], [0, -1]),
+            'symmetric_difference': ([0, -1], [-1, 0]),
+            'union': ([0, 0, -1], [0, -1, 0]),
+        }[how]
+        # the positions in empty frames are missing as well
+        idx1 = np.array(idx1) if len(df1) else np.full(len(idx1), -1)
+        idx2 = np.array(idx2) if len(df2) else np.full(len(idx2), -1)
+        template = _overlay_frame(df1, df2, idx1, idx2,
+                                  [Polygon()] * len(idx1))
+        template = template.drop(columns=template._geometry_column_name)
+    template = GeoDataFrame(template, geometry=[Polygon()] * len(template))
+    schema = infer_schema(template)
+    if dim is None:
+        schema['geometry'] = 'Unknown'
+    else:
+        geom_type = ['Point', 'LineString', 'Polygon'][dim]
+        schema['geometry'] = [geom_type, 'Multi' + geom_type] if _FIONA18 \
+            else geom_type
+    return schema
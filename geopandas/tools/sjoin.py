@@ -1,14 +1,70 @@
+from collections import OrderedDict
+import multiprocessing
 from warnings import warn
 
 import numpy as np
 import pandas as pd
+from six import string_types
 from shapely import prepared
+from shapely.geometry import Point
+from shapely.geometry.base import BaseGeometry
 
-from geopandas import GeoDataFrame
+try:
+    from shapely import vectorized
+    HAS_VECTORIZED = True
+except ImportError:
+    HAS_VECTORIZED = False
+
+from geopandas import GeoDataFrame, GeoSeries
+from geopandas.base import HAS_SINDEX
+from geopandas.sindex import _geometry_bounds
+
+
+# number of candidate pairs for which the predicate is evaluated at once
+_REFINE_CHUNKSIZE = 100000
+
+# minimum number of points tested against a geometry with a single call to
+# shapely.vectorized, which has a fixed overhead per call
+_VECTORIZED_MIN_POINTS = 16
+
+
+# the supported aggregations of sjoin_aggregate
+_AGGREGATIONS = ['count', 'sum', 'mean', 'min', 'max']
+
+# the supported binary predicates, and 'dwithin' for the geometries within
+# a given distance
+_ALLOWED_OPS = ['intersects', 'contains', 'within', 'touches', 'crosses',
+                'overlaps', 'covers', 'covered_by', 'contains_properly',
+                'dwithin']
+
+# binary predicates that can be evaluated as 'intersects' or 'contains'
+# of the other geometry and a point, when the query or the indexed geometry
+# is a point
+_POINT_QUERY_OPS = {'intersects': 'intersects',
+                    'within': 'contains',
+                    'covered_by': 'intersects'}
+_POINT_TREE_OPS = {'intersects': 'intersects',
+                   'contains': 'contains',
+                   'covers': 'intersects',
+                   'contains_properly': 'contains'}
+
+# binary predicates with the left and right geometry swapped ('properly
+# within' has no GEOS implementation, so 'contains_properly' is only
+# evaluated with the left geometry prepared, see _refine_pairs)
+_SWAPPED_OPS = {'intersects': 'intersects',
+                'contains': 'within',
+                'within': 'contains',
+                'touches': 'touches',
+                'crosses': 'crosses',
+                'overlaps': 'overlaps',
+                'covers': 'covered_by',
+                'covered_by': 'covers',
+                'dwithin': 'dwithin'}
 
 
 def sjoin(left_df, right_df, how='inner', op='intersects',
-          lsuffix='left', rsuffix='right'):
+          lsuffix='left', rsuffix='right', return_pairs=False, chunksize=None,
+          n_jobs=1, distance=None):
     """Spatial join of two GeoDataFrames.
 
     Parameters
@@ -22,16 +78,494 @@ def sjoin(left_df, right_df, how='inner', op='intersects',
         * 'inner': use intersection of keys from both dfs; retain only
           left_df geometry column
     op : string, default 'intersection'
-        Binary predicate, one of {'intersects', 'contains', 'within'}.
+        Binary predicate, one of {'intersects', 'contains', 'within',
+        'touches', 'crosses', 'overlaps', 'covers', 'covered_by',
+        'contains_properly'}, or 'dwithin' to join the geometries within
+        ``distance`` of each other.
         See http://shapely.readthedocs.io/en/latest/manual.html#binary-predicates.
     lsuffix : string, default 'left'
         Suffix to apply to overlapping column names (left GeoDataFrame).
     rsuffix : string, default 'right'
         Suffix to apply to overlapping column names (right GeoDataFrame).
+    return_pairs : bool, default False
+        If True, only return the index labels ``(left_index, right_index)``
+        of the matching pairs (as for an inner join), without gathering any
+        of the columns.
+    chunksize : int, optional
+        If given, the left frame is queried against the spatial index of the
+        right frame in chunks of this many rows, bounding the memory used
+        for the candidate pairs. The result is the same. See ``sjoin_iter``
+        to also produce the joined frame in chunks.
+    n_jobs : int, default 1
+        The number of worker processes that compute the matching pairs
+        (-1 to use all CPUs). The left frame is split in spatially compact
+        parts (of ``chunksize`` rows, if given) that are joined against the
+        spatial index of the right frame, which is sent to every worker
+        once. The result is the same as for ``n_jobs=1``.
+    distance : float, optional
+        The distance for ``op='dwithin'``. The bounds of the left geometries
+        are expanded by it to query the spatial index, and the candidates
+        are refined with the exact distance.
 
+    Returns
+    -------
+    GeoDataFrame, or a tuple of two pandas.Index if ``return_pairs=True``
     """
-    import rtree
+    _check_sjoin_args(left_df, right_df, how, op, lsuffix, rsuffix, distance)
+
+    # find the matching pairs by position, using the (cached) spatial index
+    # of one of the frames
+    if n_jobs == -1:
+        n_jobs = multiprocessing.cpu_count()
+    if n_jobs > 1:
+        l_idx, r_idx = _parallel_pairs(left_df, right_df, op, n_jobs,
+                                       chunksize, distance=distance)
+    elif chunksize is None:
+        l_idx, r_idx = _sjoin_pairs(left_df, right_df, op, distance=distance)
+    else:
+        l_idx, r_idx = _chunked_pairs(left_df, right_df, op, chunksize,
+                                      distance=distance)
+
+    if return_pairs:
+        return left_df.index.take(l_idx), right_df.index.take(r_idx)
+    return _join_frames(left_df, right_df, l_idx, r_idx, how, lsuffix,
+                        rsuffix)
+
+
+def sjoin_iter(left_df, right_df, how='inner', op='intersects',
+               lsuffix='left', rsuffix='right', chunksize=100000,
+               distance=None):
+    """Spatial join of two GeoDataFrames, processing the left one in chunks.
+
+    The chunks of the left frame are joined one by one against the spatial
+    index of the right frame, which is built only once, and the joined
+    chunks are yielded as they are ready. This bounds the memory needed for
+    joining a very large left frame, e.g. when it is read in chunks as well.
+
+    Parameters
+    ----------
+    left_df : GeoDataFrame, or iterable of GeoDataFrames
+        The left frame, or its chunks.
+    right_df : GeoDataFrame
+    how : string, default 'inner'
+        The type of join, 'inner' or 'left' (see ``sjoin``).
+    op : string, default 'intersects'
+        Binary predicate, see ``sjoin``.
+    lsuffix : string, default 'left'
+        Suffix to apply to overlapping column names (left GeoDataFrame).
+    rsuffix : string, default 'right'
+        Suffix to apply to overlapping column names (right GeoDataFrame).
+    chunksize : int, default 100000
+        The number of rows of the chunks, if ``left_df`` is a GeoDataFrame.
+    distance : float, optional
+        The distance for ``op='dwithin'``, see ``sjoin``.
+
+    Yields
+    ------
+    GeoDataFrame
+        The joined chunks. Together they hold the same rows as the result
+        of ``sjoin``.
+
+    Examples
+    --------
+    >>> counts = [chunk.groupby('zone_id').size()
+    ...           for chunk in sjoin_iter(points, zones, chunksize=10**6)]
+    ...  # doctest: +SKIP
+    """
+    if how not in ['left', 'inner']:
+        raise ValueError("`how` was \"%s\" but is expected to be in %s" %
+                         (how, ['left', 'inner']))
+    if isinstance(left_df, GeoDataFrame):
+        # check the arguments right away
+        _check_sjoin_args(left_df, right_df, how, op, lsuffix, rsuffix,
+                          distance)
+        chunks = (left_df.iloc[start:start + chunksize]
+                  for start in range(0, len(left_df), chunksize))
+        check = False
+    else:
+        chunks = iter(left_df)
+        check = True
+    return _sjoin_chunks(chunks, right_df, how, op, lsuffix, rsuffix, check,
+                         distance)
+
+
+def _sjoin_chunks(chunks, right_df, how, op, lsuffix, rsuffix, check,
+                  distance):
+    for chunk in chunks:
+        if check:
+            _check_sjoin_args(chunk, right_df, how, op, lsuffix, rsuffix,
+                              distance)
+        l_idx, r_idx = _sjoin_pairs(chunk, right_df, op, index_left=False,
+                                    distance=distance)
+        yield _join_frames(chunk, right_df, l_idx, r_idx, how, lsuffix,
+                           rsuffix)
+
+
+def _chunked_pairs(left_df, right_df, op, chunksize, distance=None):
+    """
+    ``_sjoin_pairs`` for the chunks of ``chunksize`` rows of the left frame,
+    queried against the spatial index of the right frame.
+    """
+    l_parts = [np.empty(0, dtype=np.intp)]
+    r_parts = [np.empty(0, dtype=np.intp)]
+    for start in range(0, len(left_df), chunksize):
+        chunk = left_df.iloc[start:start + chunksize]
+        l_idx, r_idx = _sjoin_pairs(chunk, right_df, op, index_left=False,
+                                    distance=distance)
+        l_parts.append(l_idx + start)
+        r_parts.append(r_idx)
+    return np.concatenate(l_parts), np.concatenate(r_parts)
+
+
+def sjoin_nearest(left_df, right_df, how='inner', max_distance=None,
+                  lsuffix='left', rsuffix='right', distance_col=None):
+    """Spatial join of two GeoDataFrames based on the distance between
+    their geometries.
+
+    Every geometry is joined with the nearest geometry of the other frame,
+    or with all of them if several are equally near. The nearest geometries
+    are found with the spatial index: the distance to the entries with the
+    nearest bounds limits the search radius, after which the exact distance
+    is only computed for the entries within that radius.
+
+    Parameters
+    ----------
+    left_df, right_df : GeoDataFrames
+    how : string, default 'inner'
+        The type of join:
+
+        * 'left': use keys from left_df, joined with the nearest geometries
+          of right_df; retain only left_df geometry column
+        * 'right': use keys from right_df, joined with the nearest
+          geometries of left_df; retain only right_df geometry column
+        * 'inner': as 'left', but drop the rows without a match (only
+          possible with ``max_distance``)
+    max_distance : float, optional
+        Only join geometries within this distance. This also limits the
+        search, so it is faster to give it when possible.
+    lsuffix : string, default 'left'
+        Suffix to apply to overlapping column names (left GeoDataFrame).
+    rsuffix : string, default 'right'
+        Suffix to apply to overlapping column names (right GeoDataFrame).
+    distance_col : string, optional
+        If given, the distances between the joined geometries are stored
+        in a column with this name.
+
+    Returns
+    -------
+    GeoDataFrame
+        The rows follow the order of the frame whose keys are used, and
+        equally near matches of a row are ordered by their position in the
+        other frame.
+
+    Examples
+    --------
+    >>> sjoin_nearest(points, stations, distance_col='distance')
+    ...  # doctest: +SKIP
+    """
+    _check_sjoin_args(left_df, right_df, how, None, lsuffix, rsuffix)
+
+    if how == 'right':
+        tree_df, query_df = left_df, right_df
+    else:
+        tree_df, query_df = right_df, left_df
+    sindex = tree_df.sindex
+    if sindex is None:
+        query_idx = tree_idx = np.empty(0, dtype=np.intp)
+        distances = np.empty(0)
+    else:
+        query_idx, tree_idx, distances = _nearest_pairs(
+            query_df.geometry.values, tree_df.geometry.values, sindex,
+            max_distance)
+    if how == 'right':
+        l_idx, r_idx = tree_idx, query_idx
+    else:
+        l_idx, r_idx = query_idx, tree_idx
+
+    pair_columns = []
+    if distance_col is not None:
+        pair_columns.append((distance_col, distances))
+    return _join_frames(left_df, right_df, l_idx, r_idx, how, lsuffix,
+                        rsuffix, pair_columns, keep_order=True)
+
+
+def _nearest_pairs(query_geoms, tree_geoms, sindex, max_distance=None):
+    """
+    The positions of the query geometries and of their nearest indexed
+    geometries (sorted by query and indexed position), and their distance.
+    """
+    query_idx = []
+    tree_idx = []
+    distances = []
+    n_candidates = 0
+    for i, geom in enumerate(query_geoms):
+        if not isinstance(geom, BaseGeometry) or geom.is_empty:
+            continue
+        bounds = geom.bounds
+        # the distance to the entries with the nearest bounds is an upper
+        # bound for the distance to the nearest geometry, which in turn is
+        # at least the distance between their bounds
+        first = np.fromiter(sindex.nearest(bounds, 1), dtype=np.intp)
+        radius = min(geom.distance(tree_geoms[j]) for j in first)
+        if max_distance is not None:
+            radius = min(radius, max_distance)
+        candidates = np.fromiter(sindex.dwithin(bounds, radius),
+                                 dtype=np.intp)
+        candidates = np.union1d(candidates, first)
+        dist = np.array([geom.distance(other)
+                         for other in tree_geoms[candidates]])
+        n_candidates += len(candidates)
+        nearest = dist == dist.min()
+        if dist.min() > radius:
+            continue
+        query_idx.extend([i] * nearest.sum())
+        tree_idx.extend(candidates[nearest])
+        distances.extend(dist[nearest])
+    sindex.record_refinement(n_candidates, len(query_idx))
+    return (np.array(query_idx, dtype=np.intp),
+            np.array(tree_idx, dtype=np.intp),
+            np.array(distances, dtype='float64'))
+
+
+def sjoin_aggregate(left_df, right_df, op='intersects', aggfunc='count',
+                    chunksize=100000, distance=None):
+    """Spatial join of two GeoDataFrames, aggregated per row of the right
+    one.
+
+    The result is that of ``sjoin(left_df, right_df, op=op)`` grouped by
+    ``'index_right'`` and aggregated with ``aggfunc``, but the joined frame
+    is never built: the matching pairs of every chunk of the left frame are
+    directly added to per right row accumulators. The rows of the right
+    frame without any match are kept as well.
+
+    Parameters
+    ----------
+    left_df, right_df : GeoDataFrames
+    op : string, default 'intersects'
+        Binary predicate, see ``sjoin``.
+    aggfunc : 'count' or dict, default 'count'
+        With 'count', the number of matching left rows is returned in a
+        'count' column. A dict maps columns of the left frame to one of
+        {'count', 'sum', 'mean', 'min', 'max'}, which (as in pandas) skip
+        the missing values.
+    chunksize : int, default 100000
+        The number of left rows of which the matching pairs are computed at
+        once, bounding the memory used.
+    distance : float, optional
+        The distance for ``op='dwithin'``, see ``sjoin``.
+
+    Returns
+    -------
+    GeoDataFrame
+        The geometry and index of the right frame, with a column per
+        aggregation. Rows without matches have a count and sum of 0, and a
+        missing mean, min and max.
+
+    Examples
+    --------
+    >>> sjoin_aggregate(points, polygons, aggfunc={'population': 'sum'})
+    ...  # doctest: +SKIP
+    """
+    _check_sjoin_args(left_df, right_df, 'inner', op, 'left', 'right',
+                      distance)
+    if isinstance(aggfunc, string_types) and aggfunc == 'count':
+        accumulators = [
+            ('count', _Accumulator(np.ones(len(left_df)), 'count',
+                                   len(right_df)))]
+    elif isinstance(aggfunc, dict):
+        accumulators = []
+        for column, func in aggfunc.items():
+            if func not in _AGGREGATIONS:
+                raise ValueError("aggregation \"%s\" is expected to be in "
+                                 "%s" % (func, _AGGREGATIONS))
+            accumulators.append(
+                (column, _Accumulator(np.asarray(left_df[column].values), func,
+                                      len(right_df))))
+    else:
+        raise ValueError("`aggfunc` should be 'count' or a dict, got %r" %
+                         (aggfunc,))
+
+    sindex = right_df.sindex
+    if sindex is not None:
+        left_geoms = left_df.geometry.values
+        right_geoms = right_df.geometry.values
+        for start in range(0, len(left_df), chunksize):
+            l_idx, r_idx = _query_geoms(
+                left_geoms[start:start + chunksize], right_geoms, sindex, op,
+                distance)
+            for _, accumulator in accumulators:
+                accumulator.add(l_idx + start, r_idx)
+
+    result = pd.DataFrame(
+        OrderedDict((column, accumulator.result())
+                    for column, accumulator in accumulators),
+        index=right_df.index)
+    geometry = right_df.geometry
+    result[geometry.name] = geometry.values
+    return GeoDataFrame(result, geometry=geometry.name, crs=right_df.crs)
+
+
+class _Accumulator(object):
+    """
+    Accumulates an aggregation (one of ``_AGGREGATIONS``) of ``values`` per
+    right row, for the matching pairs of left and right positions added.
+    """
+
+    def __init__(self, values, func, n):
+        if values.dtype.kind == 'b':
+            values = values.astype(np.int64)
+        elif func != 'count' and values.dtype.kind not in 'iuf':
+            raise TypeError("cannot compute the %s of values of dtype %s" %
+                            (func, values.dtype))
+        self.values = values
+        self.valid = ~pd.isnull(values)
+        self.func = func
+        self.count = np.zeros(n, dtype=np.int64)
+        if func in ('min', 'max'):
+            self.total = np.full(n, np.nan)
+        elif func == 'sum' and values.dtype.kind in 'iu':
+            self.total = np.zeros(n, dtype=values.dtype)
+        else:
+            self.total = np.zeros(n)
+
+    def add(self, l_idx, r_idx):
+        valid = self.valid[l_idx]
+        l_idx, r_idx = l_idx[valid], r_idx[valid]
+        self.count += np.bincount(r_idx, minlength=len(self.count))
+        if self.func == 'count' or not len(r_idx):
+            return
+        # reduce the values of every right row at once
+        order = np.argsort(r_idx, kind='mergesort')
+        r_idx = r_idx[order]
+        starts = np.flatnonzero(np.r_[True, r_idx[1:] != r_idx[:-1]])
+        rows = r_idx[starts]
+        values = self.values[l_idx[order]]
+        if self.func == 'min':
+            self.total[rows] = np.fmin(self.total[rows],
+                                       np.minimum.reduceat(values, starts))
+        elif self.func == 'max':
+            self.total[rows] = np.fmax(self.total[rows],
+                                       np.maximum.reduceat(values, starts))
+        else:
+            self.total[rows] += np.add.reduceat(values, starts)
+
+    def result(self):
+        if self.func == 'count':
+            return self.count
+        if self.func == 'mean':
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return self.total / self.count
+        return self.total
+
+
+class SpatialJoiner(object):
+    """Spatial joins of many (small) frames against a static right frame.
+
+    The spatial index of the right frame is built and its geometries are
+    prepared once, when they are first needed, and then reused by every
+    join, so that the cost of a call only depends on the geometries joined.
+    The right frame should not be modified while the joiner is used.
+
+    Parameters
+    ----------
+    right_df : GeoDataFrame
+    op : string, default 'intersects'
+        Binary predicate, see ``sjoin``.
+    distance : float, optional
+        The distance for ``op='dwithin'``, see ``sjoin``.
+
+    Examples
+    --------
+    >>> joiner = SpatialJoiner(zones, op='within')  # doctest: +SKIP
+    >>> joiner.join(points)  # doctest: +SKIP
+    >>> positions, zone_ids = joiner.lookup([Point(2, 3)])  # doctest: +SKIP
+    """
+
+    def __init__(self, right_df, op='intersects', distance=None):
+        if not isinstance(right_df, GeoDataFrame):
+            raise ValueError("'right_df' should be GeoDataFrame, got "
+                             "{}".format(type(right_df)))
+        _check_sjoin_args(right_df, right_df, 'inner', op, 'left', 'right',
+                          distance)
+        self.right_df = right_df
+        self.op = op
+        self.distance = distance
+        self._geoms = right_df.geometry.values
+        self._sindex = None
+        self._sindex_generated = False
+        self._labels = right_df.index.values
+        self._prepared = {}
+
+    def join(self, left_df, how='inner', lsuffix='left', rsuffix='right'):
+        """Spatial join of ``left_df`` with the right frame.
+
+        Parameters
+        ----------
+        left_df : GeoDataFrame
+        how : string, default 'inner'
+            The type of join, see ``sjoin``.
+        lsuffix : string, default 'left'
+            Suffix to apply to overlapping column names (left GeoDataFrame).
+        rsuffix : string, default 'right'
+            Suffix to apply to overlapping column names (right GeoDataFrame).
+
+        Returns
+        -------
+        GeoDataFrame
+            The same as ``sjoin(left_df, right_df, how, op)``.
+        """
+        _check_sjoin_args(left_df, self.right_df, how, self.op, lsuffix,
+                          rsuffix, self.distance)
+        l_idx, r_idx = self._pairs(left_df.geometry.values)
+        return _join_frames(left_df, self.right_df, l_idx, r_idx, how,
+                            lsuffix, rsuffix)
+
+    def lookup(self, geometries):
+        """The matching pairs of ``geometries`` and the right frame.
 
+        Parameters
+        ----------
+        geometries : GeoSeries, or sequence of shapely geometries
+
+        Returns
+        -------
+        positions : ndarray
+            The positions in ``geometries`` of the matching pairs.
+        labels : ndarray
+            The index labels of the right frame of the matching pairs.
+        """
+        if isinstance(geometries, BaseGeometry):
+            geometries = [geometries]
+        if isinstance(geometries, GeoSeries):
+            geometries = geometries.values
+        elif not (isinstance(geometries, np.ndarray)
+                  and geometries.dtype == object):
+            values = np.empty(len(geometries), dtype=object)
+            for i, geom in enumerate(geometries):
+                values[i] = geom
+            geometries = values
+        positions, r_idx = self._pairs(geometries)
+        return positions, self._labels[r_idx]
+
+    def _pairs(self, geometries):
+        """
+        The positions of the matching pairs of ``geometries`` and the right
+        geometries, sorted by position in ``geometries``.
+        """
+        if not self._sindex_generated:
+            self._sindex = self.right_df.sindex
+            self._sindex_generated = True
+        if self._sindex is None:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        l_idx, r_idx = _query_geoms(geometries, self._geoms, self._sindex,
+                                    self.op, self.distance, self._prepared)
+        order = np.lexsort((r_idx, l_idx))
+        return l_idx[order], r_idx[order]
+
+
+def _check_sjoin_args(left_df, right_df, how, op, lsuffix, rsuffix,
+                      distance=None):
     if not isinstance(left_df, GeoDataFrame):
         raise ValueError("'left_df' should be GeoDataFrame, got {}".format(
                          type(left_df)))
@@ -45,10 +579,14 @@ def sjoin(left_df, right_df, how='inner', op='intersects',
         raise ValueError("`how` was \"%s\" but is expected to be in %s" %
                          (how, allowed_hows))
 
-    allowed_ops = ['contains', 'within', 'intersects']
-    if op not in allowed_ops:
+    if op is not None and op not in _ALLOWED_OPS:
         raise ValueError("`op` was \"%s\" but is expected to be in %s" %
-                         (op, allowed_ops))
+                         (op, _ALLOWED_OPS))
+    if op == 'dwithin' and (distance is None or distance < 0):
+        raise ValueError("`op='dwithin'` requires a non-negative `distance`")
+
+    if not HAS_SINDEX:
+        raise ImportError("Spatial join requires the `rtree` package.")
 
     if left_df.crs != right_df.crs:
         warn(
@@ -65,108 +603,468 @@ def sjoin(left_df, right_df, how='inner', op='intersects',
         raise ValueError("'{0}' and '{1}' cannot be names in the frames being"
                          " joined".format(index_left, index_right))
 
-    # the rtree spatial index only allows limited (numeric) index types, but an
-    # index in geopandas may be any arbitrary dtype. so reset both indices now
-    # and store references to the original indices, to be reaffixed later.
-    # GH 352
-    left_df = left_df.copy(deep=True)
-    left_df.index = left_df.index.rename(index_left)
-    left_df = left_df.reset_index()
-    right_df = right_df.copy(deep=True)
-    right_df.index = right_df.index.rename(index_right)
-    right_df = right_df.reset_index()
-
-    if op == "within":
-        # within implemented as the inverse of contains; swap names
-        left_df, right_df = right_df, left_df
-
-    # insert the bounds in the rtree spatial index
-    right_df_bounds = right_df.geometry.apply(lambda x: x.bounds)
-    stream = ((i, b, None) for i, b in enumerate(right_df_bounds))
-    tree_idx = rtree.index.Index(stream)
-
-    idxmatch = (left_df.geometry.apply(lambda x: x.bounds)
-                .apply(lambda x: list(tree_idx.intersection(x))))
-    idxmatch = idxmatch[idxmatch.apply(len) > 0]
-
-    if idxmatch.shape[0] > 0:
-        # if output from join has overlapping geometries
-        r_idx = np.concatenate(idxmatch.values)
-        l_idx = np.concatenate([[i] * len(v) for i, v in idxmatch.iteritems()])
-
-        # Vectorize predicate operations
-        def find_intersects(a1, a2):
-            return a1.intersects(a2)
-
-        def find_contains(a1, a2):
-            return a1.contains(a2)
-
-        predicate_d = {'intersects': find_intersects,
-                       'contains': find_contains,
-                       'within': find_contains}
-
-        check_predicates = np.vectorize(predicate_d[op])
-
-        result = (
-            pd.DataFrame(
-                np.column_stack(
-                    [l_idx,
-                     r_idx,
-                     check_predicates(
-                         left_df.geometry
-                         .apply(lambda x: prepared.prep(x))[l_idx],
-                         right_df[right_df.geometry.name][r_idx])
-                     ]))
-        )
 
-        result.columns = ['_key_left', '_key_right', 'match_bool']
-        result = (
-            pd.DataFrame(result[result['match_bool'] == 1])
-            .drop('match_bool', axis=1)
-        )
+def _join_frames(left_df, right_df, l_idx, r_idx, how, lsuffix, rsuffix,
+                 pair_columns=(), keep_order=False):
+    """
+    Assemble the joined frame from the positions ``(l_idx, r_idx)`` of the
+    matching pairs (sorted by left position), gathering only the rows and
+    columns that end up in the result.
+
+    ``pair_columns`` holds ``(name, values)`` tuples of columns with a value
+    for every matching pair, which are appended to the result. With
+    ``keep_order``, the pairs are kept in the given order (sorted by the
+    positions of the frame whose keys are used) instead of being grouped
+    by right row as a merge would.
+    """
+    # the position of the matching pair of every row (-1 if unmatched)
+    pairs = np.arange(len(l_idx))
+    if how != 'left' and not keep_order:
+        # the matches are grouped by right row, in the order of their
+        # first match
+        uniques, first = np.unique(r_idx, return_index=True)
+        rank = np.empty(len(right_df), dtype=np.intp)
+        rank[uniques[np.argsort(first)]] = np.arange(len(uniques))
+        order = np.argsort(rank[r_idx], kind='mergesort')
+        l_idx, r_idx, pairs = l_idx[order], r_idx[order], pairs[order]
 
+    if how == 'right':
+        # the frame whose keys are used provides the geometry and index,
+        # the other one its index labels and columns without geometry
+        unmatched = _unmatched(r_idx, len(right_df))
+        missing = np.full(len(unmatched), -1, np.intp)
+        r_idx = np.concatenate([r_idx, unmatched])
+        l_idx = np.concatenate([l_idx, missing])
+        pairs = np.concatenate([pairs, missing])
+        if keep_order:
+            order = np.argsort(r_idx, kind='mergesort')
+            l_idx, r_idx, pairs = l_idx[order], r_idx[order], pairs[order]
+        keys_df, keys_idx = right_df, r_idx
+        other_df, other_idx = left_df, l_idx
+        other_name, index_name = 'index_%s' % lsuffix, 'index_%s' % rsuffix
     else:
-        # when output from the join has no overlapping geometries
-        result = pd.DataFrame(columns=['_key_left', '_key_right'], dtype=float)
-
-    if op == "within":
-        # within implemented as the inverse of contains; swap names
-        left_df, right_df = right_df, left_df
-        result = result.rename(columns={'_key_left': '_key_right',
-                                        '_key_right': '_key_left'})
-
-    if how == 'inner':
-        result = result.set_index('_key_left')
-        joined = (
-            left_df
-            .merge(result, left_index=True, right_index=True)
-            .merge(right_df.drop(right_df.geometry.name, axis=1),
-                   left_on='_key_right', right_index=True,
-                   suffixes=('_%s' % lsuffix, '_%s' % rsuffix))
-        )
-        joined = joined.set_index(index_left).drop(['_key_right'], axis=1)
-        joined.index.name = None
-    elif how == 'left':
-        result = result.set_index('_key_left')
-        joined = (
-            left_df
-            .merge(result, left_index=True, right_index=True, how='left')
-            .merge(right_df.drop(right_df.geometry.name, axis=1),
-                   how='left', left_on='_key_right', right_index=True,
-                   suffixes=('_%s' % lsuffix, '_%s' % rsuffix))
-        )
-        joined = joined.set_index(index_left).drop(['_key_right'], axis=1)
-        joined.index.name = None
-    else:  # how == 'right':
-        joined = (
-            left_df
-            .drop(left_df.geometry.name, axis=1)
-            .merge(result.merge(right_df,
-                                left_on='_key_right', right_index=True,
-                                how='right'), left_index=True,
-                   right_on='_key_left', how='right')
-            .set_index(index_right)
-        )
-        joined = joined.drop(['_key_left', '_key_right'], axis=1)
+        if how == 'left':
+            unmatched = _unmatched(l_idx, len(left_df))
+            missing = np.full(len(unmatched), -1, np.intp)
+            l_idx = np.concatenate([l_idx, unmatched])
+            r_idx = np.concatenate([r_idx, missing])
+            pairs = np.concatenate([pairs, missing])
+            order = np.argsort(l_idx, kind='mergesort')
+            l_idx, r_idx, pairs = l_idx[order], r_idx[order], pairs[order]
+        keys_df, keys_idx = left_df, l_idx
+        other_df, other_idx = right_df, r_idx
+        other_name, index_name = 'index_%s' % rsuffix, None
+
+    other_columns = [i for i, col in enumerate(other_df.columns)
+                     if col != other_df._geometry_column_name]
+    keys_part = _take(keys_df, keys_idx, np.arange(keys_df.shape[1]))
+    other_part = _take(other_df, other_idx, other_columns)
+    other_part.insert(0, other_name, _take_index(other_df.index, other_idx))
+
+    # suffixes for the column names that occur in both parts
+    overlap = set(keys_part.columns) & set(other_part.columns)
+    if overlap:
+        if how == 'right':
+            keys_suffix, other_suffix = rsuffix, lsuffix
+        else:
+            keys_suffix, other_suffix = lsuffix, rsuffix
+        keys_part.columns = _add_suffix(keys_part.columns, overlap,
+                                        keys_suffix)
+        other_part.columns = _add_suffix(other_part.columns, overlap,
+                                         other_suffix)
 
+    if how == 'right':
+        parts = [other_part, keys_part]
+    else:
+        parts = [keys_part, other_part]
+    joined = pd.concat(parts, axis=1, copy=False)
+    geometry = keys_part.columns[
+        list(keys_df.columns).index(keys_df._geometry_column_name)]
+    joined = GeoDataFrame(joined, geometry=geometry, crs=keys_df.crs)
+    for name, values in pair_columns:
+        joined[name] = _take_index(pd.Index(values), pairs).values
+    joined.index = keys_df.index.take(keys_idx)
+    joined.index.name = index_name
     return joined
+
+
+def _unmatched(idx, n):
+    """The positions below ``n`` that do not occur in ``idx``"""
+    return np.flatnonzero(np.bincount(idx, minlength=n) == 0)
+
+
+def _take(df, idx, columns):
+    """
+    The rows at the positions ``idx`` of the columns at the positions
+    ``columns`` of ``df`` as a DataFrame with a default index, with missing
+    values for the positions -1.
+    """
+    missing = idx < 0
+    if missing.all():
+        part = pd.DataFrame(df.iloc[:0, columns])
+        part = part.reindex(pd.RangeIndex(len(idx)))
+    else:
+        part = pd.DataFrame(df.iloc[np.where(missing, 0, idx), columns])
+        part.index = pd.RangeIndex(len(idx))
+        if missing.any():
+            # as in a merge, boolean columns become object columns
+            bools = part.columns[(part.dtypes == bool).values]
+            if len(bools):
+                part = part.astype(dict.fromkeys(bools, object))
+            part = part.where(
+                np.repeat(~missing[:, np.newaxis], part.shape[1], axis=1))
+    return part
+
+
+def _take_index(index, idx):
+    """The labels at the positions ``idx``, missing for the positions -1"""
+    if len(index) == 0:
+        # all missing, with the same dtype as the masked labels below
+        return pd.Series(index).reindex(pd.RangeIndex(len(idx)))
+    missing = idx < 0
+    labels = pd.Series(index.take(np.where(missing, 0, idx)))
+    if missing.any():
+        labels = labels.where(~missing)
+    return labels
+
+
+def _add_suffix(columns, names, suffix):
+    return [('%s_%s' % (col, suffix)) if col in names else col
+            for col in columns]
+
+
+def _index_left(left_df, right_df):
+    """
+    Whether to query the spatial index of the left instead of the right
+    frame.
+
+    An index that is already available is preferred (e.g. the cached index
+    of a static layer that is joined against many batches), otherwise the
+    smaller frame is indexed.
+    """
+    if left_df.has_sindex != right_df.has_sindex:
+        return left_df.has_sindex
+    if left_df.has_sindex:
+        # query with the fewest geometries
+        return len(left_df) > len(right_df)
+    return len(left_df) < len(right_df)
+
+
+def _sjoin_pairs(left_df, right_df, op, index_left=None, distance=None):
+    """
+    Returns the positions ``(l_idx, r_idx)`` of the pairs of rows of
+    ``left_df`` and ``right_df`` of which the geometries satisfy ``op``,
+    sorted by left and then right position.
+
+    The spatial index of the left frame is queried if ``index_left`` is
+    True, of the right frame if False, and if None the side is chosen by
+    ``_index_left`` (for the predicates that can be swapped).
+    """
+    if index_left is None:
+        index_left = (op in _SWAPPED_OPS
+                      and _index_left(left_df, right_df))
+    if index_left:
+        r_idx, l_idx = _query_pairs(right_df, left_df, _SWAPPED_OPS[op],
+                                    distance)
+    else:
+        l_idx, r_idx = _query_pairs(left_df, right_df, op, distance)
+    order = np.lexsort((r_idx, l_idx))
+    return l_idx[order], r_idx[order]
+
+
+def _query_pairs(query_df, tree_df, op, distance=None):
+    """
+    Queries the spatial index of ``tree_df`` with the bounds of all the
+    geometries of ``query_df`` at once (expanded by ``distance`` for
+    'dwithin'), and refines the candidate pairs with ``op``.
+    """
+    sindex = tree_df.sindex
+    if sindex is None:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    return _query_geoms(query_df.geometry.values, tree_df.geometry.values,
+                        sindex, op, distance)
+
+
+def _query_geoms(query_geoms, tree_geoms, sindex, op, distance=None,
+                 prepared_tree=None):
+    """
+    ``_query_pairs`` for the arrays of geometries and the index.
+
+    ``prepared_tree`` is an optional cache of the prepared indexed
+    geometries by position, used (and filled) by the refinement.
+    """
+    query_bounds = _geometry_bounds(query_geoms)
+    if op == 'dwithin':
+        query_idx, tree_idx = sindex.query_bulk(
+            query_bounds + [-distance, -distance, distance, distance])
+        keep = _refine_distance(query_geoms, tree_geoms, query_idx,
+                                tree_idx, distance)
+    else:
+        query_idx, tree_idx = sindex.query_bulk(query_bounds)
+        keep = _refine(query_geoms, tree_geoms, query_idx, tree_idx, op,
+                       query_bounds, prepared_tree)
+    sindex.record_refinement(len(keep), int(keep.sum()))
+    return query_idx[keep], tree_idx[keep]
+
+
+# the right geometries, their spatial index and the predicate in the worker
+# processes of a parallel join, see _init_worker
+_worker_state = {}
+
+
+def _init_worker(tree_geoms, sindex, op, distance=None):
+    _worker_state['args'] = (tree_geoms, sindex, op, distance)
+
+
+def _worker_pairs(task):
+    positions, query_geoms = task
+    query_idx, tree_idx = _query_geoms(query_geoms, *_worker_state['args'])
+    return positions[query_idx], tree_idx
+
+
+def _parallel_pairs(left_df, right_df, op, n_jobs, chunksize=None,
+                    distance=None):
+    """
+    ``_sjoin_pairs`` computed by ``n_jobs`` worker processes, which each
+    receive the right geometries and their spatial index once. The left
+    frame is split in spatially compact parts, following a Z-order curve
+    through the centers of the bounds, to limit the number of index nodes
+    every worker has to visit.
+    """
+    sindex = right_df.sindex
+    if sindex is None or not len(left_df):
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    left_geoms = left_df.geometry.values
+    order = _spatial_order(_geometry_bounds(left_geoms))
+    if chunksize is None:
+        # a few parts per worker to balance the load
+        chunksize = int(np.ceil(len(order) / (4.0 * n_jobs)))
+    tasks = [(order[start:start + chunksize],
+              left_geoms[order[start:start + chunksize]])
+             for start in range(0, len(order), chunksize)]
+
+    pool = multiprocessing.Pool(
+        n_jobs, initializer=_init_worker,
+        initargs=(right_df.geometry.values, sindex, op, distance))
+    try:
+        results = pool.map(_worker_pairs, tasks)
+    finally:
+        pool.close()
+        pool.join()
+
+    l_idx = np.concatenate([l_part for l_part, _ in results])
+    r_idx = np.concatenate([r_part for _, r_part in results])
+    order = np.lexsort((r_idx, l_idx))
+    return l_idx[order], r_idx[order]
+
+
+def _spatial_order(bounds):
+    """
+    The positions of the (n, 4) ``bounds`` sorted along a Z-order curve
+    through their centers, with the missing bounds at the end.
+    """
+    x = (bounds[:, 0] + bounds[:, 2]) / 2
+    y = (bounds[:, 1] + bounds[:, 3]) / 2
+    valid = ~np.isnan(x)
+    code = np.full(len(bounds), 1 << 32, dtype=np.int64)
+    if valid.any():
+        code[valid] = (_spread_bits(_scale(x[valid]))
+                       | (_spread_bits(_scale(y[valid])) << 1))
+    return np.argsort(code, kind='mergesort')
+
+
+def _scale(values):
+    """``values`` mapped to integers in [0, 65535]"""
+    low, high = values.min(), values.max()
+    if high == low:
+        return np.zeros(len(values), dtype=np.int64)
+    return ((values - low) / (high - low) * 65535).astype(np.int64)
+
+
+def _spread_bits(values):
+    """Inserts a zero bit before every bit of the 16 bit integers"""
+    values = (values | (values << 8)) & 0x00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F
+    values = (values | (values << 2)) & 0x33333333
+    return (values | (values << 1)) & 0x55555555
+
+
+def _refine(query_geoms, tree_geoms, query_idx, tree_idx, op, query_bounds,
+            prepared_tree=None):
+    """
+    Evaluates ``op`` for the candidate pairs of ``query_geoms[query_idx]``
+    and ``tree_geoms[tree_idx]`` (grouped by query position), and returns
+    the boolean mask of the matching pairs.
+
+    Pairs of a point and another geometry are evaluated with
+    ``shapely.vectorized`` where possible, see ``_refine_points``. The
+    prepared indexed geometries are taken from and added to the
+    ``prepared_tree`` cache, if given.
+    """
+    keep = np.zeros(len(query_idx), dtype=bool)
+    todo = np.ones(len(query_idx), dtype=bool)
+    if HAS_VECTORIZED and op in _POINT_QUERY_OPS:
+        sel = np.flatnonzero(_is_point(query_geoms)[query_idx])
+        if len(sel):
+            bounds = query_bounds[query_idx[sel]]
+            keep[sel] = _refine_points(
+                tree_geoms, tree_idx[sel], query_geoms[query_idx[sel]],
+                bounds[:, 0], bounds[:, 1], _POINT_QUERY_OPS[op],
+                prepared_tree)
+            todo[sel] = False
+    if HAS_VECTORIZED and op in _POINT_TREE_OPS:
+        sel = np.flatnonzero(_is_point(tree_geoms)[tree_idx] & todo)
+        if len(sel):
+            bounds = _geometry_bounds(tree_geoms)[tree_idx[sel]]
+            keep[sel] = _refine_points(
+                query_geoms, query_idx[sel], tree_geoms[tree_idx[sel]],
+                bounds[:, 0], bounds[:, 1], _POINT_TREE_OPS[op])
+            todo[sel] = False
+    if todo.any():
+        sel = np.flatnonzero(todo)
+        keep[sel] = _refine_pairs(
+            query_geoms, tree_geoms, query_idx[sel], tree_idx[sel], op,
+            prepared_tree=prepared_tree)
+    return keep
+
+
+def _refine_distance(query_geoms, tree_geoms, query_idx, tree_idx, distance):
+    """
+    Returns the boolean mask of the candidate pairs of
+    ``query_geoms[query_idx]`` and ``tree_geoms[tree_idx]`` that are within
+    ``distance`` of each other. The distance between two points is computed
+    in bulk from their coordinates.
+    """
+    keep = np.zeros(len(query_idx), dtype=bool)
+    points = (_is_point(query_geoms)[query_idx]
+              & _is_point(tree_geoms)[tree_idx])
+    sel = np.flatnonzero(points)
+    if len(sel):
+        query_xy = _geometry_bounds(query_geoms)[query_idx[sel], :2]
+        tree_xy = _geometry_bounds(tree_geoms)[tree_idx[sel], :2]
+        keep[sel] = np.hypot(*(query_xy - tree_xy).T) <= distance
+    sel = np.flatnonzero(~points)
+    keep[sel] = [query_geom.distance(tree_geom) <= distance
+                 for query_geom, tree_geom in zip(query_geoms[query_idx[sel]],
+                                                  tree_geoms[tree_idx[sel]])]
+    return keep
+
+
+def _is_point(geoms):
+    return np.array([isinstance(geom, Point) for geom in geoms], dtype=bool)
+
+
+def _refine_points(geoms, idx, points, x, y, op, prepared_geoms=None):
+    """
+    Evaluates ``op`` ('intersects' or 'contains') for the pairs of
+    ``geoms[idx]`` and ``points`` (with coordinates ``x`` and ``y``),
+    testing all the points of a geometry in a single call to
+    ``shapely.vectorized.contains`` (if there are enough of them).
+    ``prepared_geoms`` is an optional cache of the prepared ``geoms`` by
+    position.
+    """
+    keep = np.zeros(len(idx), dtype=bool)
+    order = np.argsort(idx, kind='mergesort')
+    starts = np.flatnonzero(
+        np.concatenate([[True], idx[order][1:] != idx[order][:-1]]))
+    ends = np.append(starts[1:], len(idx))
+    intersects = prepared.PreparedGeometry.intersects
+    predicate = getattr(prepared.PreparedGeometry, op)
+    for start, end in zip(starts, ends):
+        sel = order[start:end]
+        if prepared_geoms is None:
+            geom = prepared.prep(geoms[idx[sel[0]]])
+        else:
+            geom = _prepared(prepared_geoms, geoms, idx[sel[0]])
+        if len(sel) < _VECTORIZED_MIN_POINTS:
+            keep[sel] = [predicate(geom, point) for point in points[sel]]
+            continue
+        matches = vectorized.contains(geom, x[sel], y[sel])
+        if op == 'intersects':
+            # the points that are not in the interior can still be on the
+            # boundary (vectorized.touches is much slower than this)
+            rest = np.flatnonzero(~matches)
+            matches[rest] = [intersects(geom, point)
+                             for point in points[sel[rest]]]
+        keep[sel] = matches
+    return keep
+
+
+def _prepared(cache, geoms, i):
+    """``geoms[i]`` prepared, taken from or added to the ``cache``"""
+    if i not in cache:
+        cache[i] = prepared.prep(geoms[i])
+    return cache[i]
+
+
+def _refine_pairs(query_geoms, tree_geoms, query_idx, tree_idx, op,
+                  chunksize=_REFINE_CHUNKSIZE, prepared_tree=None):
+    """
+    Evaluates ``op`` for the candidate pairs of ``query_geoms[query_idx]``
+    and ``tree_geoms[tree_idx]`` (grouped by query position), and returns
+    the boolean mask of the matching pairs.
+
+    A geometry that occurs in several pairs is prepared once, on the side
+    where it is repeated most; pairs of geometries that occur only once are
+    evaluated directly, as preparing would not pay off. A side is only
+    prepared if shapely provides the prepared predicate for it ('covers' has no
+    prepared inverse), and always if there is no unprepared predicate
+    ('covered_by' and 'contains_properly'). If a ``prepared_tree`` cache is
+    given, the indexed geometries are prepared whenever possible, as that
+    pays off over repeated calls. The pairs are processed in chunks of
+    ``chunksize`` to limit the size of the intermediate arrays.
+    """
+    n = len(query_idx)
+    keep = np.zeros(n, dtype=bool)
+    if not n:
+        return keep
+    group_start = np.flatnonzero(np.r_[True, query_idx[1:] != query_idx[:-1]])
+    group_size = np.diff(np.r_[group_start, n])
+    query_count = np.repeat(group_size, group_size)
+    tree_count = np.bincount(tree_idx)[tree_idx]
+    predicate = getattr(BaseGeometry, op, None)
+    prepared_predicate = getattr(prepared.PreparedGeometry, op, None)
+    swapped_predicate = None
+    if op in _SWAPPED_OPS:
+        swapped_predicate = getattr(
+            prepared.PreparedGeometry, _SWAPPED_OPS[op], None)
+    if prepared_tree is not None and swapped_predicate is not None:
+        prepare_query = np.zeros(n, dtype=bool)
+    elif prepared_predicate is None:
+        prepare_query = np.zeros(n, dtype=bool)
+    elif swapped_predicate is not None:
+        prepare_query = (query_count > 1) & (query_count >= tree_count)
+    elif predicate is not None:
+        prepare_query = query_count > 1
+    else:
+        prepare_query = np.ones(n, dtype=bool)
+    if swapped_predicate is None:
+        prepare_tree = np.zeros(n, dtype=bool)
+    elif predicate is not None and prepared_tree is None:
+        prepare_tree = ~prepare_query & (tree_count > 1)
+    else:
+        prepare_tree = ~prepare_query
+    if prepared_tree is None:
+        prepared_tree = {}
+    last_query = (None, None)
+    for start in range(0, n, chunksize):
+        chunk = slice(start, start + chunksize)
+        pairs = zip(query_idx[chunk], tree_idx[chunk],
+                    query_geoms[query_idx[chunk]], tree_geoms[tree_idx[chunk]],
+                    prepare_query[chunk], prepare_tree[chunk])
+        matches = []
+        for i, j, query_geom, tree_geom, prep_query, prep_tree in pairs:
+            if prep_query:
+                # the pairs of a query geometry are consecutive
+                if last_query[0] != i:
+                    last_query = (i, prepared.prep(query_geom))
+                matches.append(prepared_predicate(last_query[1], tree_geom))
+            elif prep_tree:
+                matches.append(swapped_predicate(
+                    _prepared(prepared_tree, tree_geoms, j), query_geom))
+            else:
+                matches.append(predicate(query_geom, tree_geom))
+        keep[chunk] = matches
+    return keep
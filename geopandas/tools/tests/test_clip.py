@@ -0,0 +1,104 @@
+from __future__ import absolute_import
+
+from shapely.geometry import LineString, MultiPoint, Point, Polygon, box
+
+import geopandas
+from geopandas import GeoDataFrame, GeoSeries, clip
+from geopandas.testing import assert_geodataframe_equal, assert_geoseries_equal
+
+import pytest
+
+
+@pytest.fixture
+def mask():
+    return box(0, 0, 10, 10)
+
+
+@pytest.fixture
+def points():
+    # inside, on the boundary, outside, missing
+    return GeoDataFrame(
+        {'attr': [1, 2, 3, 4]},
+        geometry=[Point(2, 2), Point(10, 5), Point(20, 20), None],
+        index=list('abcd'), crs={'init': 'epsg:3857'})
+
+
+@pytest.fixture
+def lines():
+    # inside, crossing the boundary, outside, touching the boundary
+    return GeoDataFrame(
+        {'attr': [1, 2, 3, 4]},
+        geometry=[LineString([(2, 2), (4, 4)]), LineString([(5, 5), (15, 5)]),
+                  LineString([(20, 20), (30, 30)]),
+                  LineString([(10, 20), (10, 10), (20, 10)])],
+        crs={'init': 'epsg:3857'})
+
+
+def test_clip_points(points, mask):
+    result = clip(points, mask)
+    expected = points.iloc[:2]
+    assert_geodataframe_equal(result, expected)
+    # the geometries inside the mask are passed through
+    assert result.geometry.values[0] is points.geometry.values[0]
+
+
+def test_clip_lines(lines, mask):
+    result = clip(lines, mask)
+    assert list(result.index) == [0, 1, 3]
+    assert_geoseries_equal(
+        result.geometry,
+        GeoSeries([lines.geometry[0], LineString([(5, 5), (10, 5)]),
+                   Point(10, 10)], index=[0, 1, 3], crs=lines.crs))
+    assert list(result['attr']) == [1, 2, 4]
+
+    result = clip(lines, mask, keep_geom_type=True)
+    assert list(result.index) == [0, 1]
+
+
+def test_clip_polygons(mask):
+    polygons = GeoDataFrame(
+        geometry=[box(1, 1, 2, 2), box(8, 8, 12, 12), box(20, 20, 21, 21),
+                  box(10, 0, 12, 2)])
+    result = clip(polygons, mask)
+    assert_geoseries_equal(
+        result.geometry,
+        GeoSeries([box(1, 1, 2, 2), box(8, 8, 10, 10),
+                   LineString([(10, 0), (10, 2)])], index=[0, 1, 3]))
+    result = clip(polygons, mask, keep_geom_type=True)
+    assert list(result.index) == [0, 1]
+
+
+def test_clip_geoseries(points, mask):
+    series = points.geometry.rename('points')
+    result = clip(series, mask)
+    assert isinstance(result, GeoSeries)
+    assert result.name == 'points'
+    assert_geoseries_equal(result, series.iloc[:2])
+
+
+def test_clip_frame_mask(points):
+    masks = GeoDataFrame(geometry=[box(0, 0, 5, 5), box(5, 0, 10, 10)],
+                         crs=points.crs)
+    assert_geodataframe_equal(clip(points, masks), points.iloc[:2])
+    assert_geodataframe_equal(clip(points, masks.geometry), points.iloc[:2])
+    with pytest.warns(UserWarning):
+        clip(points, masks.to_crs(epsg=4326))
+
+
+def test_clip_no_sindex(points, mask, monkeypatch):
+    monkeypatch.setattr(geopandas.base, 'HAS_SINDEX', False)
+    assert_geodataframe_equal(clip(points, mask), points.iloc[:2])
+
+
+def test_clip_empty(points, mask):
+    result = clip(points.iloc[:0], mask)
+    assert_geodataframe_equal(result, points.iloc[:0])
+    result = clip(points, Polygon())
+    assert_geodataframe_equal(result, points.iloc[:0])
+
+
+def test_clip_bad_mask(points):
+    with pytest.raises(TypeError):
+        clip(points, Point(0, 0))
+    with pytest.raises(TypeError):
+        clip(points, GeoSeries([MultiPoint([(0, 0), (1, 1)])]))
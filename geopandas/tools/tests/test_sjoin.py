@@ -4,11 +4,12 @@ from distutils.version import LooseVersion
 
 import numpy as np
 import pandas as pd
-from shapely.geometry import Point, Polygon
+from shapely.geometry import LineString, Point, Polygon
 
 import geopandas
 from geopandas import GeoDataFrame, GeoSeries, read_file, base
-from geopandas import sjoin
+from geopandas import sjoin, sjoin_aggregate, sjoin_iter, sjoin_nearest
+from geopandas.tools import SpatialJoiner
 
 import pytest
 from pandas.util.testing import assert_frame_equal
@@ -133,6 +134,19 @@ class TestSpatialJoin:
         assert empty.index_left.isnull().all()
         empty = sjoin(not_in, polygons, how='inner', op='intersects')
         assert empty.empty
+        assert empty.index_right.dtype == polygons.index.dtype
+        empty = sjoin(not_in.iloc[:0], polygons, how='left')
+        assert empty.empty
+        assert empty.index_right.dtype == polygons.index.dtype
+        empty = sjoin(not_in, polygons.iloc[:0], how='right')
+        assert empty.index_left.dtype == not_in.index.dtype
+        # no matches, with string labels
+        polygons.index = ['a', 'b']
+        empty = sjoin(not_in, polygons, how='left')
+        assert empty.index_right.dtype == object
+        assert empty.index_right.isnull().all()
+        empty = sjoin(not_in, polygons, how='inner')
+        assert empty.index_right.dtype == object
 
     @pytest.mark.parametrize('dfs', ['default-index', 'string-index'],
                              indirect=True)
@@ -168,6 +182,358 @@ class TestSpatialJoin:
 
         assert_frame_equal(res, exp, check_index_type=False)
 
+    @pytest.mark.parametrize('dfs', ['default-index', 'string-index'],
+                             indirect=True)
+    @pytest.mark.parametrize('op', ['intersects', 'contains', 'within'])
+    def test_cached_sindex(self, op, dfs):
+        index, df1, df2, expected = dfs
+
+        # the existing index of the left frame is used
+        sindex = df1.sindex
+        assert not df2.has_sindex
+        res = sjoin(df1, df2, op=op)
+        assert df1.sindex is sindex
+        assert not df2.has_sindex
+        assert sindex.stats()['queries'] == 3
+        assert sindex.stats()['matches'] == len(res)
+
+        # same result when querying the index of the right frame
+        df1._invalidate_sindex()
+        assert df2.sindex is not None
+        assert_frame_equal(sjoin(df1, df2, op=op), res)
+        assert not df1.has_sindex
+
+    def test_index_smaller_frame(self):
+        points = GeoDataFrame(
+            geometry=[Point(x, x) for x in np.linspace(0, 10, 50)])
+        polygons = GeoDataFrame(
+            geometry=[Polygon([(0, 0), (5, 0), (5, 5), (0, 5)])])
+        res = sjoin(points, polygons, op='within')
+        assert len(res) == 24
+        assert polygons.has_sindex
+        assert not points.has_sindex
+
+    @pytest.mark.parametrize('dfs', ['default-index', 'string-index'],
+                             indirect=True)
+    @pytest.mark.parametrize('op', ['intersects', 'contains', 'within'])
+    def test_return_pairs(self, op, dfs):
+        index, df1, df2, expected = dfs
+
+        left, right = sjoin(df1, df2, op=op, return_pairs=True)
+        res = sjoin(df1, df2, how='inner', op=op)
+        assert list(left) == list(res.index)
+        assert list(right) == list(res['index_right'])
+
+    @pytest.mark.parametrize('how', ['left', 'right', 'inner'])
+    def test_duplicate_column_suffix(self, how):
+        df1 = GeoDataFrame({'a': [1, 2]},
+                           geometry=[Point(0, 0), Point(5, 5)])
+        df2 = GeoDataFrame({'a': [3, 4], 'b': [True, False]},
+                           geometry=[Point(0, 0), Point(1, 1)])
+        res = sjoin(df1, df2, how=how, lsuffix='l', rsuffix='r')
+        assert list(res.columns[res.columns.str.startswith('a')]) == [
+            'a_l', 'a_r']
+        assert res.geometry.name == 'geometry'
+        # the inputs are not modified
+        assert list(df1.columns) == ['a', 'geometry']
+        assert list(df2.columns) == ['a', 'b', 'geometry']
+
+    @pytest.mark.parametrize('dfs', ['default-index', 'string-index'],
+                             indirect=True)
+    @pytest.mark.parametrize('how', ['left', 'right', 'inner'])
+    @pytest.mark.parametrize('chunksize', [1, 2, 10])
+    def test_chunksize(self, how, chunksize, dfs):
+        index, df1, df2, expected = dfs
+
+        res = sjoin(df1, df2, how=how, chunksize=chunksize)
+        assert_frame_equal(res, sjoin(df1, df2, how=how))
+
+    @pytest.mark.parametrize('dfs', ['default-index', 'string-index'],
+                             indirect=True)
+    @pytest.mark.parametrize('how', ['left', 'right', 'inner'])
+    @pytest.mark.parametrize('op', ['intersects', 'contains', 'within'])
+    def test_n_jobs(self, how, op, dfs):
+        index, df1, df2, expected = dfs
+
+        res = sjoin(df1, df2, how=how, op=op, n_jobs=2)
+        assert_frame_equal(res, sjoin(df1, df2, how=how, op=op))
+        res = sjoin(df1, df2, how=how, op=op, n_jobs=2, chunksize=1)
+        assert_frame_equal(res, sjoin(df1, df2, how=how, op=op))
+
+    @pytest.mark.parametrize('dfs', ['default-index', 'string-index'],
+                             indirect=True)
+    @pytest.mark.parametrize('how', ['left', 'inner'])
+    def test_sjoin_iter(self, how, dfs):
+        index, df1, df2, expected = dfs
+        expected = sjoin(df1, df2, how=how)
+
+        chunks = list(sjoin_iter(df1, df2, how=how, chunksize=2))
+        assert len(chunks) == 2
+        assert all(isinstance(chunk, GeoDataFrame) for chunk in chunks)
+        assert_frame_equal(pd.concat(chunks), expected, check_dtype=False)
+
+        # an iterable of chunks
+        chunks = sjoin_iter([df1.iloc[:1], df1.iloc[1:]], df2, how=how)
+        assert_frame_equal(pd.concat(list(chunks)), expected,
+                           check_dtype=False)
+
+    def test_sjoin_iter_invalid_args(self):
+        df = GeoDataFrame(geometry=[Point(0, 0)])
+        with pytest.raises(ValueError, match="`how` was"):
+            sjoin_iter(df, df, how='right')
+        with pytest.raises(ValueError, match="`op` was"):
+            sjoin_iter(df, df, op='spandex')
+
+    @pytest.mark.parametrize('op', ['intersects', 'contains', 'within'])
+    def test_points(self, op):
+        # points in the interior, on the boundary and outside of the polygons
+        points = GeoDataFrame(
+            {'a': range(5)},
+            geometry=[Point(1, 1), Point(2, 0), Point(3, 3), Point(2, 2),
+                      Point(9, 9)])
+        polygons = GeoDataFrame(
+            {'b': range(3)},
+            geometry=[Polygon([(0, 0), (2, 0), (2, 2), (0, 2)]),
+                      Polygon([(1, 1), (4, 1), (4, 4), (1, 4)]),
+                      Point(2, 2).buffer(0.5).boundary])
+        expected = [(left, right)
+                    for left, point in enumerate(points.geometry)
+                    for right, geom in enumerate(polygons.geometry)
+                    if getattr(point, op)(geom)]
+        for indexed in [polygons, points]:
+            # query with the points, and query the index of the points
+            points._invalidate_sindex()
+            polygons._invalidate_sindex()
+            indexed.sindex
+            res = sjoin(points, polygons, op=op)
+            assert sorted(zip(res.index, res['index_right'])) == expected
+
+    @pytest.mark.parametrize('op', ['touches', 'crosses', 'overlaps',
+                                    'covers', 'covered_by',
+                                    'contains_properly'])
+    def test_predicates(self, op):
+        geoms = [Polygon([(0, 0), (2, 0), (2, 2), (0, 2)]),
+                 Polygon([(1, 1), (3, 1), (3, 3), (1, 3)]),
+                 Polygon([(2, 0), (4, 0), (4, 2), (2, 2)]),
+                 Polygon([(0.5, 0.5), (1, 0.5), (1, 1), (0.5, 1)]),
+                 LineString([(-1, 1), (5, 1)]),
+                 LineString([(0, 0), (2, 0)]),
+                 Point(1, 1), Point(2, 2), Point(0.5, 0.5)]
+        df1 = GeoDataFrame({'a': range(9)}, geometry=geoms)
+        df2 = GeoDataFrame({'b': range(9)}, geometry=geoms[::-1])
+
+        def predicate(left, right):
+            if op == 'covered_by':
+                return right.covers(left)
+            if op == 'contains_properly':
+                # the DE-9IM pattern T**FF*FF*
+                matrix = left.relate(right)
+                return (matrix[0] != 'F' and
+                        matrix[3:5] + matrix[6:8] == 'FFFF')
+            return getattr(left, op)(right)
+
+        expected = [(left, right)
+                    for left, g1 in enumerate(df1.geometry)
+                    for right, g2 in enumerate(df2.geometry)
+                    if predicate(g1, g2)]
+        assert expected
+        for indexed in [df1, df2]:
+            df1._invalidate_sindex()
+            df2._invalidate_sindex()
+            indexed.sindex
+            res = sjoin(df1, df2, op=op)
+            assert sorted(zip(res.index, res['index_right'])) == expected
+
+    @pytest.mark.parametrize('distance', [0, 0.5, 1.5])
+    def test_dwithin(self, distance):
+        df1 = GeoDataFrame(
+            {'a': range(4)},
+            geometry=[Point(0, 0), Point(1, 0), Point(3, 3),
+                      LineString([(0, 5), (5, 5)])])
+        df2 = GeoDataFrame(
+            {'b': range(3)},
+            geometry=[Point(0, 1), Point(3, 4),
+                      Polygon([(2, 0), (3, 0), (3, 1), (2, 1)])])
+        expected = [(left, right)
+                    for left, g1 in enumerate(df1.geometry)
+                    for right, g2 in enumerate(df2.geometry)
+                    if g1.distance(g2) <= distance]
+        for n_jobs in [1, 2]:
+            res = sjoin(df1, df2, op='dwithin', distance=distance,
+                        n_jobs=n_jobs)
+            assert sorted(zip(res.index, res['index_right'])) == expected
+
+        with pytest.raises(ValueError):
+            sjoin(df1, df2, op='dwithin')
+
+    @pytest.mark.parametrize('dfs', ['default-index', 'string-index'],
+                             indirect=True)
+    @pytest.mark.parametrize('op', ['intersects', 'within', 'contains',
+                                    'covered_by', 'touches'])
+    @pytest.mark.parametrize('how', ['left', 'right', 'inner'])
+    def test_spatial_joiner(self, how, op, dfs):
+        index, df1, df2, expected = dfs
+
+        joiner = SpatialJoiner(df2, op=op)
+        for _ in range(2):
+            res = joiner.join(df1, how=how)
+            assert_frame_equal(res, sjoin(df1, df2, how=how, op=op))
+        # the right geometries are prepared once
+        prepared = dict(joiner._prepared)
+        joiner.join(df1, how=how)
+        assert all(joiner._prepared[i] is prepared[i] for i in prepared)
+
+    def test_spatial_joiner_lookup(self):
+        polygons = GeoDataFrame(
+            {'a': range(2)},
+            geometry=[Polygon([(0, 0), (2, 0), (2, 2), (0, 2)]),
+                      Polygon([(1, 1), (3, 1), (3, 3), (1, 3)])],
+            index=['x', 'y'])
+        joiner = SpatialJoiner(polygons, op='covered_by')
+        # the spatial index is only built by the first lookup
+        assert not polygons.has_sindex
+
+        positions, labels = joiner.lookup(
+            [Point(0.5, 0.5), Point(5, 5), Point(1.5, 1.5), None])
+        assert list(positions) == [0, 2, 2]
+        assert list(labels) == ['x', 'x', 'y']
+        assert polygons.has_sindex
+
+        positions, labels = joiner.lookup(Point(2.5, 2.5))
+        assert list(positions) == [0]
+        assert list(labels) == ['y']
+
+        positions, labels = joiner.lookup(GeoSeries([Point(9, 9)]))
+        assert len(positions) == len(labels) == 0
+
+        with pytest.raises(ValueError):
+            SpatialJoiner(polygons, op='spandex')
+        with pytest.raises(ValueError):
+            SpatialJoiner(polygons.geometry)
+
+
+@pytest.mark.skipif(not base.HAS_SINDEX, reason='Rtree absent, skipping')
+class TestSpatialJoinAggregate:
+
+    def setup_method(self):
+        self.points = GeoDataFrame(
+            {'a': [1, 2, 3, 4, 5, 6],
+             'b': [0.5, np.nan, 1.5, 2.5, -1., 3.],
+             'c': [True, False, True, True, False, True]},
+            geometry=[Point(1, 1), Point(2, 2), Point(3, 3), Point(4, 4),
+                      Point(1, 3), Point(9, 9)],
+            crs={'init': 'epsg:4326'})
+        self.polygons = GeoDataFrame(
+            {'d': range(3)},
+            geometry=[Polygon([(0, 0), (3, 0), (3, 3), (0, 3)]),
+                      Polygon([(2, 2), (5, 2), (5, 5), (2, 5)]),
+                      Polygon([(10, 0), (11, 0), (11, 1), (10, 1)])],
+            index=['x', 'y', 'z'], crs={'init': 'epsg:4326'})
+
+    @pytest.mark.parametrize('chunksize', [1, 4, 100])
+    def test_aggregate(self, chunksize):
+        aggfunc = {'a': 'sum', 'b': 'mean', 'c': 'sum'}
+        res = sjoin_aggregate(self.points, self.polygons, aggfunc=aggfunc,
+                              chunksize=chunksize)
+        expected = sjoin(self.points, self.polygons).groupby(
+            'index_right').agg(aggfunc)
+        assert list(res.columns) == ['a', 'b', 'c', 'geometry']
+        assert list(res.index) == ['x', 'y', 'z']
+        assert res.crs == self.polygons.crs
+        assert (res.geometry == self.polygons.geometry).all()
+        for column in ['a', 'b', 'c']:
+            assert list(res[column][:2]) == list(expected[column])
+        assert res['a'].dtype == np.int64
+        assert list(res.loc['z', ['a', 'c']]) == [0, 0]
+        assert np.isnan(res.loc['z', 'b'])
+
+    @pytest.mark.parametrize('func', ['count', 'sum', 'mean', 'min', 'max'])
+    def test_aggfunc(self, func):
+        res = sjoin_aggregate(self.points, self.polygons, op='within',
+                              aggfunc={'b': func}, chunksize=2)
+        expected = sjoin(self.points, self.polygons, op='within').groupby(
+            'index_right')['b'].agg(func)
+        assert list(res['b'][:2]) == list(expected)
+
+    def test_count(self):
+        res = sjoin_aggregate(self.points, self.polygons)
+        # the points on the boundary intersect as well
+        assert list(res['count']) == [4, 3, 0]
+
+    def test_invalid_args(self):
+        with pytest.raises(ValueError):
+            sjoin_aggregate(self.points, self.polygons, aggfunc={'a': 'std'})
+        with pytest.raises(ValueError):
+            sjoin_aggregate(self.points, self.polygons, aggfunc='sum')
+        with pytest.raises(ValueError):
+            sjoin_aggregate(self.points, self.polygons, op='spandex')
+
+
+@pytest.mark.skipif(not base.HAS_SINDEX, reason='Rtree absent, skipping')
+class TestSpatialJoinNearest:
+
+    def setup_method(self):
+        self.points = GeoDataFrame(
+            {'a': range(4)},
+            geometry=[Point(0, 0), Point(5, 5), Point(3, 0), Point(20, 20)])
+        self.polygons = GeoDataFrame(
+            {'b': range(3)},
+            geometry=[Polygon([(1, -1), (2, -1), (2, 1), (1, 1)]),
+                      Polygon([(4, -1), (5, -1), (5, 1), (4, 1)]),
+                      Point(5, 8).buffer(1)],
+            index=[10, 11, 12])
+
+    def test_nearest(self):
+        res = sjoin_nearest(self.points, self.polygons,
+                            distance_col='distance')
+        # the point at (3, 0) is as near to both of the squares
+        assert list(res.index) == [0, 1, 2, 2, 3]
+        assert list(res['index_right']) == [10, 12, 10, 11, 12]
+        assert list(res['b']) == [0, 2, 0, 1, 2]
+        assert list(res['distance'][:4]) == pytest.approx([1, 2, 1, 1])
+        for point, geom, distance in zip(
+                res.geometry, self.polygons.geometry[res['index_right']],
+                res['distance']):
+            assert point.distance(geom) == distance
+            assert distance == min(
+                point.distance(other) for other in self.polygons.geometry)
+
+    def test_max_distance(self):
+        res = sjoin_nearest(self.points, self.polygons, max_distance=1.5)
+        assert list(res.index) == [0, 2, 2]
+        assert 'distance' not in res
+
+        res = sjoin_nearest(self.points, self.polygons, how='left',
+                            max_distance=1.5, distance_col='distance')
+        assert list(res.index) == [0, 1, 2, 2, 3]
+        assert res['index_right'].isnull().tolist() == [
+            False, True, False, False, True]
+        assert res['distance'].isnull().tolist() == [
+            False, True, False, False, True]
+
+    def test_right(self):
+        res = sjoin_nearest(self.points, self.polygons, how='right',
+                            distance_col='distance')
+        assert res.index.name == 'index_right'
+        # the points at (0, 0) and (3, 0) are as near to the first square
+        assert list(res.index) == [10, 10, 11, 12]
+        assert list(res['index_left']) == [0, 2, 2, 1]
+        assert list(res['distance']) == pytest.approx([1, 1, 1, 2])
+        assert (res.geometry == self.polygons.geometry[res.index]).all()
+
+    def test_right_max_distance(self):
+        # only the circle is matched, by the point at (5, 5)
+        res = sjoin_nearest(self.points.iloc[[1]], self.polygons,
+                            how='right', max_distance=2.5,
+                            distance_col='distance')
+        assert list(res.index) == [10, 11, 12]
+        assert res['index_left'].isnull().tolist() == [True, True, False]
+        assert res['distance'].isnull().tolist() == [True, True, False]
+
+    def test_invalid_args(self):
+        with pytest.raises(ValueError):
+            sjoin_nearest(self.points, self.polygons, how='outer')
+
 
 @pytest.mark.skipif(not base.HAS_SINDEX, reason='Rtree absent, skipping')
 class TestSpatialJoinNYBB: